@@ -3,6 +3,9 @@ import { User, MapPin, Code, Phone, Briefcase, Smartphone, CheckCircle, AlertCir
 import styled, { keyframes } from 'styled-components';
 import { NavBar, Footer } from './NavAndFooter';
 
+// How often to poll a queued search, and how long to wait before giving up on it
+const SEARCH_POLL_INTERVAL_MS = 2000;
+const SEARCH_MAX_WAIT_MS = 3 * 60 * 1000;
 
 const stripeAnimation = keyframes`
   0% { transform: rotate(0deg); }
@@ -693,6 +696,30 @@ const CandidateForm = () => {
         .filter(job => job.matchScore > 0);
     };
 
+    const waitForSearchResults = async (taskId) => {
+        const giveUpAt = Date.now() + SEARCH_MAX_WAIT_MS;
+        while (true) {
+            const taskResponse = await fetch(`https://ducky-ai-b2et.onrender.com/api/tasks/${taskId}`, {
+                headers: { 'Accept': 'application/json' },
+            });
+            if (!taskResponse.ok) {
+                throw new Error(`Server error: ${taskResponse.status} ${taskResponse.statusText}`);
+            }
+
+            const task = await taskResponse.json();
+            if (task.status === 'done') {
+                return task.result;
+            }
+            if (task.status === 'failed') {
+                throw new Error(task.error || 'Job search failed');
+            }
+            if (Date.now() >= giveUpAt) {
+                throw new Error('The job search is taking longer than expected. Please try again in a few minutes.');
+            }
+            await new Promise(resolve => setTimeout(resolve, SEARCH_POLL_INTERVAL_MS));
+        }
+    };
+
     const handleFindInternships = async () => {
         setIsProcessing(true);
         setError('');
@@ -735,7 +762,12 @@ const CandidateForm = () => {
                 throw new Error(errorMessage);
             }
 
-            const result = await response.json();
+            const submission = await response.json();
+            console.log('Submission accepted:', submission);
+
+            // Search runs in the background on the server, poll until it finishes
+            const result = await waitForSearchResults(submission.task_id);
+            result.message = submission.message;
             console.log('Success response:', result);
             
             // Step 2: Filter and rank the jobs from the server
@@ -1,27 +1,212 @@
-import os
 import time
+_process_started = time.perf_counter()
+
+import os
+import json
+import csv
+import io
+import base64
+import hashlib
+import re
 import random
-from flask import Flask, request, jsonify
+import math
+import shutil
+import socket
+import sqlite3
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import importlib.util
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
-from supabase import create_client, Client
 from dotenv import load_dotenv
 import requests
-from bs4 import BeautifulSoup
-from twilio.rest import Client as TwilioClient
-
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.exceptions import MaxRetryError, ResponseError
+
+# Selenium, BeautifulSoup, Supabase, Twilio and redis are imported where they
+# are first used, see warm_imports() for loading them ahead of a gunicorn fork
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+## --- Startup Timing ---
+STARTUP_TIMINGS = {}
+_last_startup_mark = _process_started
+
+def mark_startup(phase):
+    """Record how long the startup phase that just finished took, in ms"""
+    global _last_startup_mark
+    now = time.perf_counter()
+    STARTUP_TIMINGS[phase] = round((now - _last_startup_mark) * 1000, 1)
+    _last_startup_mark = now
+
+mark_startup("imports")
 
 # Load environment variables
-load_dotenv()
-load_dotenv('.env')
-load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+
+## --- Logging ---
+# LOG_LEVEL picks the threshold (DEBUG shows every scraped card), LOG_FORMAT=json
+# writes one JSON object per line. Messages use %-style arguments, so a call
+# below the threshold returns before anything is formatted.
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+
+class JsonLogFormatter(logging.Formatter):
+    """Render a record as JSON, including any fields passed through `extra`"""
+    reserved = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "msg": record.getMessage()
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in self.reserved)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+log = logging.getLogger("ducky")
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(JsonLogFormatter() if LOG_FORMAT == "json"
+                          else logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+log.addHandler(_log_handler)
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+
+## --- Metrics ---
+# Per-process counters, gauges and histograms, rendered in the Prometheus text
+# format by /api/metrics. Under gunicorn every worker keeps and reports its own.
+METRICS = []
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+        METRICS.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, dict(zip(self.labels, key)), value) for key, value in self.values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                # One count per bucket, then the running sum and total count
+                counts = self.values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the block takes, with outcome="error" when it raises"""
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            if "outcome" in self.labels:
+                labels["outcome"] = outcome
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self.lock:
+            values = [(dict(zip(self.labels, key)), list(counts)) for key, counts in self.values.items()]
+        samples = []
+        for labels, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((self.name + "_bucket", {**labels, "le": f"{bound:g}"}, cumulative))
+            samples.append((self.name + "_bucket", {**labels, "le": "+Inf"}, counts[-1]))
+            samples.append((self.name + "_sum", labels, counts[-2]))
+            samples.append((self.name + "_count", labels, counts[-1]))
+        return samples
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def render_metrics():
+    """Prometheus text exposition of every registered metric"""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            label_text = ",".join(f'{key}="{_label_value(val)}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+SCRAPE_SECONDS = Histogram("ducky_scrape_duration_seconds", "Time for one source to return its listings", ("source", "outcome"))
+SCRAPE_CARDS = Counter("ducky_scrape_cards_total", "Job cards returned per source", ("source",))
+PARSE_FAILURES = Counter("ducky_parse_failures_total", "Job cards that could not be parsed", ("source",))
+DRIVER_LAUNCH_SECONDS = Histogram("ducky_driver_launch_seconds", "Time to launch a Chrome driver", ("outcome",))
+DB_SECONDS = Histogram("ducky_db_duration_seconds", "Supabase call latency", ("operation", "outcome"))
+SMS_SECONDS = Histogram("ducky_sms_send_duration_seconds", "SMS transport send latency", ("outcome",))
+HTTP_IN_FLIGHT = Gauge("ducky_http_requests_in_flight", "API requests currently being served")
+HTTP_SECONDS = Histogram("ducky_http_request_duration_seconds", "API request latency", ("endpoint", "method", "status"))
 
 app = Flask(__name__)
 CORS(app, resources={
@@ -33,52 +218,161 @@ CORS(app, resources={
 })
 
 # Debug: Print environment variables (remove in production)
-print("Environment check:")
-print(f"SUPABASE_URL: {os.environ.get('SUPABASE_URL', 'NOT FOUND')}")
-print(f"SUPABASE_SERVICE_ROLE_KEY: {os.environ.get('SUPABASE_SERVICE_ROLE_KEY', 'NOT FOUND')[:5]}...")
-print(f"TWILIO_ACCOUNT_SID: {os.environ.get('TWILIO_ACCOUNT_SID', 'NOT FOUND')}")
+log.debug("Environment check:")
+log.debug("SUPABASE_URL: %s", os.environ.get('SUPABASE_URL', 'NOT FOUND'))
+log.debug("SUPABASE_SERVICE_ROLE_KEY: %s...", os.environ.get('SUPABASE_SERVICE_ROLE_KEY', 'NOT FOUND')[:5])
+log.debug("TWILIO_ACCOUNT_SID: %s", os.environ.get('TWILIO_ACCOUNT_SID', 'NOT FOUND'))
 
 # LinkedIn dummy credentials (you'll need to add these to your .env file)
 LINKEDIN_EMAIL = os.environ.get("LINKEDIN_EMAIL", "your_dummy_email@example.com")
 LINKEDIN_PASSWORD = os.environ.get("LINKEDIN_PASSWORD", "your_dummy_password")
 
-# Supabase setup with better error handling
+# Site base URLs, overridable so the scrapers can be pointed at a local stand-in
+LINKEDIN_BASE_URL = os.environ.get("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+INDEED_BASE_URL = os.environ.get("INDEED_BASE_URL", "https://www.indeed.com")
+GLASSDOOR_BASE_URL = os.environ.get("GLASSDOOR_BASE_URL", "https://www.glassdoor.com")
+INTERNSHALA_BASE_URL = os.environ.get("INTERNSHALA_BASE_URL", "https://internshala.com")
+GOOGLE_BASE_URL = os.environ.get("GOOGLE_BASE_URL", "https://www.google.com")
+
+# Supabase setup: the client is created on first use, so neither startup nor
+# the first request waits on a Supabase round-trip
 supabase = None
-try:
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-    if supabase_url and supabase_key:
-        supabase: Client = create_client(supabase_url, supabase_key)
-        print("Supabase client initialized successfully")
-        
-        # Test the connection
-        test_response = supabase.table("candidates").select("*").limit(1).execute()
-        print("Supabase connection test successful")
-    else:
-        print("ERROR: Supabase credentials not found. Database functionality will be disabled.")
-except Exception as e:
-    print(f"Error initializing Supabase: {e}. Database functionality will be disabled.")
-    supabase = None
+supabase_url = os.environ.get("SUPABASE_URL")
+supabase_key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+_supabase_lock = threading.Lock()
+if not (supabase_url and supabase_key):
+    log.warning("Supabase credentials not found. Database functionality will be disabled.")
+
+def get_supabase():
+    """Return the Supabase client, creating it on first use"""
+    global supabase
+    if supabase is None and supabase_url and supabase_key:
+        with _supabase_lock:
+            if supabase is None:
+                try:
+                    from supabase import create_client
+                    supabase = create_client(supabase_url, supabase_key)
+                    log.debug("Supabase client initialized successfully")
+                except Exception as e:
+                    log.error("Error initializing Supabase: %s. Database functionality will be disabled.", e)
+    return supabase
 
-# Twilio setup
+# Twilio setup: like Supabase, the client is only created when first needed
 twilio_client = None
-try:
-    twilio_sid = os.environ.get("TWILIO_ACCOUNT_SID")
-    twilio_token = os.environ.get("TWILIO_AUTH_TOKEN")
-    twilio_number = os.environ.get("TWILIO_PHONE_NUMBER")
-    if twilio_sid and twilio_token:
-        twilio_client = TwilioClient(twilio_sid, twilio_token)
-        print("Twilio client initialized successfully")
-    else:
-        print("Twilio credentials not found - SMS functionality disabled")
-except Exception as e:
-    print(f"Error initializing Twilio: {e}. SMS functionality will be disabled.")
+twilio_sid = os.environ.get("TWILIO_ACCOUNT_SID")
+twilio_token = os.environ.get("TWILIO_AUTH_TOKEN")
+twilio_number = os.environ.get("TWILIO_PHONE_NUMBER")
+_twilio_lock = threading.Lock()
+if not (twilio_sid and twilio_token):
+    log.warning("Twilio credentials not found - SMS functionality disabled")
+
+def get_twilio_client():
+    """Return the Twilio client, creating it on first use"""
+    global twilio_client
+    if twilio_client is None and twilio_sid and twilio_token:
+        with _twilio_lock:
+            if twilio_client is None:
+                try:
+                    from twilio.rest import Client as TwilioClient
+                    twilio_client = TwilioClient(twilio_sid, twilio_token)
+                    log.debug("Twilio client initialized successfully")
+                except Exception as e:
+                    log.error("Error initializing Twilio: %s. SMS functionality will be disabled.", e)
+    return twilio_client
+
+mark_startup("config")
+
+## --- Background Tasks ---
+# Periodic jobs are registered with @background_task and started once per
+# worker process on its first request, so they also survive a gunicorn fork.
+BACKGROUND_TASKS = []
+_background_started = False
+_background_lock = threading.Lock()
+
+def background_task(interval, workers=1):
+    """Register a function to run every `interval` seconds in `workers` daemon threads.
+    An interval of None runs it once when the worker starts."""
+    def register(func):
+        BACKGROUND_TASKS.append((func, interval, workers))
+        return func
+    return register
+
+def _run_periodically(func, interval):
+    while True:
+        try:
+            func()
+        except Exception as e:
+            log.error("Error in background task %s: %s", func.__name__, e)
+        if interval is None:
+            return
+        time.sleep(interval)
+
+def start_background_tasks():
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return
+        _background_started = True
+    for func, interval, workers in BACKGROUND_TASKS:
+        for _ in range(workers):
+            threading.Thread(target=_run_periodically, args=(func, interval), name=func.__name__, daemon=True).start()
+
+@app.before_request
+def ensure_background_tasks():
+    if not _background_started:
+        mark_startup("first_request")
+        start_background_tasks()
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    HTTP_IN_FLIGHT.inc()
+
+@app.after_request
+def record_request_metrics(response):
+    # Label by route rule rather than path so task ids do not explode the series
+    rule = request.url_rule.rule if request.url_rule else "unmatched"
+    HTTP_SECONDS.observe(time.perf_counter() - g.get("metrics_started", time.perf_counter()),
+                         endpoint=rule, method=request.method, status=response.status_code)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if "metrics_started" in g:
+        HTTP_IN_FLIGHT.dec()
 
 ## --- Selenium Helper Functions ---
+# SELENIUM_PROFILE=lean (the default) runs Chrome headless, stops waiting for a
+# page once its DOM is ready and never downloads images, fonts or media, which
+# the scrapers do not read. SELENIUM_PROFILE=full loads pages like a normal
+# visible browser, for debugging a scraper by watching it.
+SELENIUM_PROFILES = {
+    "lean": {"headless": True, "page_load_strategy": "eager", "block_resources": True},
+    "full": {"headless": False, "page_load_strategy": "normal", "block_resources": False},
+}
+SELENIUM_PROFILE = SELENIUM_PROFILES.get(os.environ.get("SELENIUM_PROFILE", "lean"), SELENIUM_PROFILES["lean"])
+SELENIUM_BLOCKED_URLS = os.environ.get(
+    "SELENIUM_BLOCKED_URLS",
+    "*.png,*.jpg,*.jpeg,*.gif,*.webp,*.svg,*.ico,*.woff,*.woff2,*.ttf,*.otf,*.mp4,*.webm,*.mp3"
+).split(",")
+SELENIUM_WAIT_TIMEOUT = float(os.environ.get("SELENIUM_WAIT_TIMEOUT", "10"))
+
 def create_selenium_driver():
     """Create and configure Chrome driver for web scraping"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     chrome_options = Options()
-    # chrome_options.add_argument("--headless")  # REMOVED for demonstration
+    chrome_options.page_load_strategy = SELENIUM_PROFILE["page_load_strategy"]
+    if SELENIUM_PROFILE["headless"]:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1280,900")
+    if SELENIUM_PROFILE["block_resources"]:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -87,36 +381,362 @@ def create_selenium_driver():
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        with DRIVER_LAUNCH_SECONDS.time():
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if SELENIUM_PROFILE["block_resources"]:
+                # Fonts and media are not covered by the image setting, drop them at the network layer
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": SELENIUM_BLOCKED_URLS})
         return driver
     except Exception as e:
-        print(f"Error creating Chrome driver: {e}")
+        log.error("Error creating Chrome driver: %s", e)
         return None
 
-def random_delay(min_seconds=1, max_seconds=3):
-    """Add random delay to avoid detection"""
-    time.sleep(random.uniform(min_seconds, max_seconds))
+## --- Selenium Driver Pool ---
+# Chrome is expensive to launch, so drivers are kept warm and handed out per
+# scrape. A driver is recycled after DRIVER_MAX_USES scrapes or once its
+# browser processes grow past DRIVER_MAX_MEMORY_MB (needs psutil).
+DRIVER_POOL_SIZE = int(os.environ.get("DRIVER_POOL_SIZE", "2"))
+DRIVER_POOL_WARM = int(os.environ.get("DRIVER_POOL_WARM", str(DRIVER_POOL_SIZE)))
+DRIVER_MAX_USES = int(os.environ.get("DRIVER_MAX_USES", "20"))
+DRIVER_MAX_MEMORY_MB = int(os.environ.get("DRIVER_MAX_MEMORY_MB", "700"))
+DRIVER_ACQUIRE_TIMEOUT = float(os.environ.get("DRIVER_ACQUIRE_TIMEOUT", "20"))
+
+class DriverPool:
+    """Bounded pool of reusable Chrome drivers"""
+
+    def __init__(self, size, max_uses, max_memory_mb):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.uses = {}
+        self.in_use = 0
+        self.created = 0
+        self.recycled = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _launch(self):
+        driver = create_selenium_driver()
+        if driver:
+            with self.lock:
+                self.created += 1
+                self.uses[id(driver)] = 0
+        return driver
+
+    def warm(self, count):
+        """Launch up to `count` drivers ahead of the first scrape"""
+        for _ in range(min(count, self.size)):
+            if not self.slots.acquire(blocking=False):
+                break
+            try:
+                driver = self._launch()
+                if not driver:
+                    break
+                self.idle.put(driver)
+            finally:
+                self.slots.release()
+        log.info("Driver pool warmed with %s drivers", self.idle.qsize())
+
+    def acquire(self):
+        """Check out a driver, or return None if none became available in time"""
+        started = time.monotonic()
+        if not self.slots.acquire(timeout=DRIVER_ACQUIRE_TIMEOUT):
+            with self.lock:
+                self.timeouts += 1
+            log.warning("Timed out waiting for a Selenium driver")
+            return None
+        waited = time.monotonic() - started
+
+        try:
+            driver = self.idle.get_nowait()
+        except queue.Empty:
+            driver = self._launch()
+        if not driver:
+            self.slots.release()
+            return None
+
+        with self.lock:
+            self.in_use += 1
+            self.acquisitions += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return driver
+
+    def release(self, driver):
+        """Return a driver to the pool, resetting or recycling it"""
+        try:
+            with self.lock:
+                self.in_use -= 1
+                self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+                uses = self.uses[id(driver)]
+
+            if uses >= self.max_uses:
+                log.warning("Recycling driver after %s uses", uses)
+                self._discard(driver)
+            elif self._memory_mb(driver) > self.max_memory_mb:
+                log.warning("Recycling driver above %sMB", self.max_memory_mb)
+                self._discard(driver)
+            elif not self._reset(driver):
+                self._discard(driver)
+            else:
+                self.idle.put(driver)
+        finally:
+            self.slots.release()
+
+    def _reset(self, driver):
+        """Clear cookies and storage so the next scrape starts from a clean browser"""
+        try:
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            log.error("Error resetting driver: %s", e)
+            return False
+
+    def _memory_mb(self, driver):
+        if not psutil:
+            return 0
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def _discard(self, driver):
+        with self.lock:
+            self.recycled += 1
+            self.uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            log.error("Error quitting driver: %s", e)
+
+    def close(self):
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": self.size,
+                "idle": self.idle.qsize(),
+                "in_use": self.in_use,
+                "created": self.created,
+                "recycled": self.recycled,
+                "acquisitions": self.acquisitions,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.acquisitions * 1000, 1) if self.acquisitions else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 1)
+            }
+
+driver_pool = DriverPool(DRIVER_POOL_SIZE, DRIVER_MAX_USES, DRIVER_MAX_MEMORY_MB)
+atexit.register(driver_pool.close)
+
+@background_task(None)
+def warm_driver_pool():
+    # Runs in each worker after the fork, so no Chrome is launched in a preloading parent
+    if DRIVER_POOL_WARM > 0:
+        driver_pool.warm(DRIVER_POOL_WARM)
+
+def wait_for_cards(driver, selector, minimum, timeout=SELENIUM_WAIT_TIMEOUT):
+    """Wait until at least `minimum` elements match `selector` and return them.
+
+    Scrolls between checks so lazily loaded listings keep arriving, and returns
+    whatever matched once the timeout passes.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+
+    def enough_cards(driver):
+        cards = driver.find_elements(By.CSS_SELECTOR, selector)
+        if len(cards) >= minimum:
+            return cards
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.25).until(enough_cards)
+    except TimeoutException:
+        return driver.find_elements(By.CSS_SELECTOR, selector)
+
+## --- Shared HTTP Session ---
+# All requests-based scrapers share one pooled session, so repeated scrapes
+# reuse keep-alive connections per host. Transient failures are retried with
+# jittered backoff, but only while the shared retry budget allows it, so a
+# struggling site is not hit with a retry storm.
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "8"))
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(os.environ.get("HTTP_RETRY_BACKOFF", "0.5"))
+HTTP_RETRY_BUDGET_RATIO = float(os.environ.get("HTTP_RETRY_BUDGET_RATIO", "0.2"))
+HTTP_VALIDATOR_CACHE_ENTRIES = int(os.environ.get("HTTP_VALIDATOR_CACHE_ENTRIES", "500"))
+# Listing pages run to hundreds of KB, so the cached bodies are bounded by size too
+HTTP_VALIDATOR_CACHE_BYTES = int(float(os.environ.get("HTTP_VALIDATOR_CACHE_MB", "8")) * 1024 * 1024)
+
+SCRAPER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+class RetryBudget:
+    """Token bucket that earns `ratio` of a retry per request, capped at `burst` retries"""
+
+    def __init__(self, ratio, burst=10):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = float(burst)
+        self.lock = threading.Lock()
+        self.denied = 0
+
+    def deposit(self):
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self.lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            self.denied += 1
+            return False
+
+http_retry_budget = RetryBudget(HTTP_RETRY_BUDGET_RATIO)
+
+class BudgetedRetry(Retry):
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if not http_retry_budget.withdraw():
+            raise MaxRetryError(_pool, url, error or ResponseError("retry budget exhausted"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+def create_http_session():
+    session = requests.Session()
+    session.headers.update(SCRAPER_HEADERS)
+    retry = BudgetedRetry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        backoff_jitter=HTTP_RETRY_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=HTTP_POOL_MAXSIZE, pool_block=True, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+http_session = create_http_session()
+_validators = OrderedDict()
+_validators_lock = threading.Lock()
+_http_stats = {"requests": 0, "not_modified": 0, "wire_bytes": 0, "decoded_bytes": 0, "validator_cache_bytes": 0}
+
+def http_get(url, timeout=10, **kwargs):
+    """GET through the shared session, revalidating with ETag/Last-Modified when the URL was seen before.
+
+    A 304 is turned back into a 200 carrying the cached body, so callers can
+    treat every response the same way.
+    """
+    with _validators_lock:
+        cached = _validators.get(url)
+        if cached:
+            _validators.move_to_end(url)
+
+    headers = kwargs.pop("headers", {})
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    http_retry_budget.deposit()
+    response = http_session.get(url, headers=headers, timeout=timeout, **kwargs)
+    wire_bytes = response.raw.tell() if response.raw else 0
+
+    not_modified = response.status_code == 304 and cached
+    if not_modified:
+        response.status_code = 200
+        response._content = cached["content"]
+    elif (response.ok and (response.headers.get("ETag") or response.headers.get("Last-Modified"))
+          and len(response.content) <= HTTP_VALIDATOR_CACHE_BYTES):
+        with _validators_lock:
+            previous = _validators.pop(url, None)
+            if previous:
+                _http_stats["validator_cache_bytes"] -= len(previous["content"])
+            _validators[url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content": response.content
+            }
+            _http_stats["validator_cache_bytes"] += len(response.content)
+            while (len(_validators) > HTTP_VALIDATOR_CACHE_ENTRIES
+                   or _http_stats["validator_cache_bytes"] > HTTP_VALIDATOR_CACHE_BYTES):
+                _, evicted = _validators.popitem(last=False)
+                _http_stats["validator_cache_bytes"] -= len(evicted["content"])
+
+    with _validators_lock:
+        _http_stats["requests"] += 1
+        _http_stats["not_modified"] += 1 if not_modified else 0
+        _http_stats["wire_bytes"] += wire_bytes
+        _http_stats["decoded_bytes"] += len(response.content)
+    return response
+
+def http_stats():
+    """Connection reuse and transfer metrics for the shared session"""
+    connections = 0
+    pool_requests = 0
+    for adapter in set(http_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool:
+                connections += pool.num_connections
+                pool_requests += pool.num_requests
+    with _validators_lock:
+        stats = dict(_http_stats)
+    stats["connections_opened"] = connections
+    stats["connection_reuse_rate"] = round(1 - connections / pool_requests, 3) if pool_requests else 0.0
+    stats["retries_denied"] = http_retry_budget.denied
+    return stats
 
 ## --- Enhanced Scraping Functions with Selenium ---
-def scrape_linkedin_with_selenium(skills, location):
+def scrape_linkedin_with_selenium(skills, location, page=1):
     """Scrape LinkedIn using Selenium with login"""
-    print(f"Starting LinkedIn Selenium scraping for skills: {skills}, location: {location}")
+    log.debug("Starting LinkedIn Selenium scraping for skills: %s, location: %s", skills, location)
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.common.keys import Keys
+    from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
     job_list = []
     driver = None
     
     try:
-        driver = create_selenium_driver()
+        driver = driver_pool.acquire()
         if not driver:
             return job_list
             
         # Login to LinkedIn
-        print("Logging into LinkedIn...")
-        driver.get("https://www.linkedin.com/login")
-        random_delay(2, 4)
+        log.debug("Logging into LinkedIn...")
+        driver.get(f"{LINKEDIN_BASE_URL}/login")
         
         # Enter credentials
-        email_field = WebDriverWait(driver, 10).until(
+        email_field = WebDriverWait(driver, SELENIUM_WAIT_TIMEOUT).until(
             EC.presence_of_element_located((By.ID, "username"))
         )
         password_field = driver.find_element(By.ID, "password")
@@ -125,34 +745,35 @@ def scrape_linkedin_with_selenium(skills, location):
         password_field.send_keys(LINKEDIN_PASSWORD)
         password_field.send_keys(Keys.RETURN)
         
-        random_delay(3, 5)
+        try:
+            WebDriverWait(driver, SELENIUM_WAIT_TIMEOUT).until(
+                lambda driver: "login" not in driver.current_url or "challenge" in driver.current_url
+            )
+        except TimeoutException:
+            pass
         
         # Check if login was successful
         if "challenge" in driver.current_url or "login" in driver.current_url:
-            print("LinkedIn login may have failed or requires verification")
+            log.warning("LinkedIn login may have failed or requires verification")
             return job_list
             
-        print("LinkedIn login successful")
+        log.debug("LinkedIn login successful")
         
         # Navigate to jobs search
         search_query = skills.replace(',', ' ')
         location_query = location
-        jobs_url = f"https://www.linkedin.com/jobs/search/?keywords={search_query}&location={location_query}&f_TPR=r86400&f_JT=I"
+        jobs_url = f"{LINKEDIN_BASE_URL}/jobs/search/?keywords={search_query}&location={location_query}&f_TPR=r86400&f_JT=I"
+        if page > 1:
+            jobs_url += f"&start={(page - 1) * MAX_CARDS}"
         
         driver.get(jobs_url)
-        random_delay(3, 5)
         
-        # Scroll to load more jobs
-        for _ in range(3):
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            random_delay(2, 3)
+        # Scrolls until enough job cards have loaded, instead of a fixed number of times
+        job_cards = wait_for_cards(driver, "div.base-card, li.jobs-search-results__list-item, div.job-search-card", MAX_CARDS)
         
-        # Find job cards
-        job_cards = driver.find_elements(By.CSS_SELECTOR, "div.base-card, li.jobs-search-results__list-item, div.job-search-card")
+        log.debug("Found %s job cards", len(job_cards))
         
-        print(f"Found {len(job_cards)} job cards")
-        
-        for i, card in enumerate(job_cards[:10]):
+        for i, card in enumerate(job_cards[:MAX_CARDS]):
             try:
                 title_elem = None
                 title_selectors = [
@@ -183,6 +804,8 @@ def scrape_linkedin_with_selenium(skills, location):
                     except NoSuchElementException:
                         continue
                 
+                location_elems = card.find_elements(By.CSS_SELECTOR, "span.job-search-card__location, .job-card-container__metadata-item")
+                
                 if title_elem and company_elem:
                     title = title_elem.text.strip()
                     company = company_elem.text.strip()
@@ -193,47 +816,53 @@ def scrape_linkedin_with_selenium(skills, location):
                             job_list.append({
                                 'title': title,
                                 'company': company,
+                                'location': location_elems[0].text.strip() if location_elems else "",
                                 'link': link.split('?')[0],
                                 'source': 'LinkedIn (Selenium)'
                             })
-                            print(f"Added: {title} at {company}")
+                            log.debug("Added: %s at %s", title, company)
                 
             except Exception as e:
-                print(f"Error processing job card {i}: {e}")
+                PARSE_FAILURES.inc(source="linkedin")
+                log.debug("Error processing job card %s: %s", i, e)
                 continue
                 
     except Exception as e:
-        print(f"Error in LinkedIn Selenium scraping: {e}")
+        log.error("Error in LinkedIn Selenium scraping: %s", e)
     finally:
         if driver:
-            driver.quit()
+            driver_pool.release(driver)
     
     return job_list
 
-def scrape_indeed_with_selenium(skills, location):
+def scrape_indeed_with_selenium(skills, location, page=1):
     """Enhanced Indeed scraping with Selenium"""
-    print(f"Starting Indeed Selenium scraping for skills: {skills}, location: {location}")
+    log.debug("Starting Indeed Selenium scraping for skills: %s, location: %s", skills, location)
+    from selenium.webdriver.common.by import By
+
     job_list = []
     driver = None
     
     try:
-        driver = create_selenium_driver()
+        driver = driver_pool.acquire()
         if not driver:
-            return scrape_indeed_basic(skills, location)
+            return scrape_indeed_basic(skills, location, page)
         
         search_query = "+".join([skill.strip() for skill in skills.split(',')])
         location_query = location.replace(' ', '+')
-        url = f"https://www.indeed.com/jobs?q={search_query}+internship&l={location_query}"
+        url = f"{INDEED_BASE_URL}/jobs?q={search_query}+internship&l={location_query}"
+        if page > 1:
+            url += f"&start={(page - 1) * MAX_CARDS}"
         
         driver.get(url)
-        random_delay(2, 4)
         
-        job_cards = driver.find_elements(By.CSS_SELECTOR, "div[data-jk], .job_seen_beacon")
+        job_cards = wait_for_cards(driver, "div[data-jk], .job_seen_beacon", MAX_CARDS)
         
-        for card in job_cards[:10]:
+        for card in job_cards[:MAX_CARDS]:
             try:
                 title_elem = card.find_element(By.CSS_SELECTOR, "h2.jobTitle a, h2 a[data-jk]")
                 company_elem = card.find_element(By.CSS_SELECTOR, "span.companyName, .companyName")
+                location_elems = card.find_elements(By.CSS_SELECTOR, ".companyLocation")
                 
                 if title_elem and company_elem:
                     title = title_elem.text.strip()
@@ -246,226 +875,2138 @@ def scrape_indeed_with_selenium(skills, location):
                     job_list.append({
                         'title': title,
                         'company': company,
+                        'location': location_elems[0].text.strip() if location_elems else "",
                         'link': link,
                         'source': 'Indeed (Selenium)'
                     })
                     
             except Exception as e:
-                print(f"Error processing Indeed job card: {e}")
+                PARSE_FAILURES.inc(source="indeed")
+                log.debug("Error processing Indeed job card: %s", e)
                 continue
                 
     except Exception as e:
-        print(f"Error in Indeed Selenium scraping: {e}")
-        return scrape_indeed_basic(skills, location)
+        log.error("Error in Indeed Selenium scraping: %s", e)
+        return scrape_indeed_basic(skills, location, page)
     finally:
         if driver:
-            driver.quit()
+            driver_pool.release(driver)
     
     return job_list
 
-def scrape_indeed_basic(skills, location):
+## --- HTML Parsing ---
+# Listing pages are parsed with a C-backed parser when lxml is installed, and
+# only the job card subtrees are built (SoupStrainer), since everything else on
+# the page is thrown away. HTML_PARSER=html.parser / HTML_PARTIAL_PARSING=0
+# restore the old full pure-Python parse.
+LXML_AVAILABLE = importlib.util.find_spec("lxml") is not None
+HTML_PARSER = os.environ.get("HTML_PARSER") or ("lxml" if LXML_AVAILABLE else "html.parser")
+HTML_PARTIAL_PARSING = os.environ.get("HTML_PARTIAL_PARSING", "1") != "0"
+# Sources that page by offset are walked MAX_CARDS at a time. Sources that only
+# take a page number (Glassdoor, Internshala) keep every card on each page, or
+# the cards after the first MAX_CARDS of a page could never be reached.
+MAX_CARDS = 10
+
+def _strainer_attrs(attrs):
+    # While parsing, SoupStrainer sees class as the raw "a b" string rather than
+    # a list of classes, so match single class names against its split values
+    strain = dict(attrs)
+    if isinstance(strain.get('class'), str):
+        wanted = strain['class']
+        strain['class'] = lambda value: bool(value) and wanted in value.split()
+    return strain
+
+def parse_cards(content, name, attrs, limit=MAX_CARDS):
+    """Return the first `limit` elements matching name/attrs (all of them if None)"""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    strainer = SoupStrainer(name, _strainer_attrs(attrs)) if HTML_PARTIAL_PARSING else None
+    soup = BeautifulSoup(content, HTML_PARSER, parse_only=strainer)
+    return soup.find_all(name, attrs, limit=limit)
+
+def parse_indeed(content):
+    job_list = []
+    for card in parse_cards(content, 'div', {'data-jk': True}):
+        try:
+            title_elem = card.find('h2', class_='jobTitle')
+            company_elem = card.find('span', class_='companyName')
+            link_elem = card.find('a', {'data-jk': True})
+            location_elem = card.find('div', class_='companyLocation')
+            
+            if title_elem and company_elem and link_elem:
+                title = title_elem.get_text(strip=True)
+                company = company_elem.get_text(strip=True)
+                location = location_elem.get_text(strip=True) if location_elem else ""
+                link = f"https://www.indeed.com{link_elem['href']}"
+                job_list.append({'title': title, 'company': company, 'location': location, 'link': link, 'source': 'Indeed'})
+        except Exception as e:
+            PARSE_FAILURES.inc(source="indeed")
+            log.debug("Error processing Indeed job card: %s", e)
+            continue
+    return job_list
+
+def parse_glassdoor(content, limit=MAX_CARDS):
+    job_list = []
+    for card in parse_cards(content, 'li', {'class': 'react-job-listing'}, limit):
+        try:
+            title_elem = card.find('a', {'data-test': 'job-link'})
+            company_elem = card.find('a', {'data-test': 'employer-link'})
+            location_elem = card.find(attrs={'data-test': 'emp-location'})
+            
+            if title_elem and company_elem:
+                title = title_elem.get_text(strip=True)
+                company = company_elem.get_text(strip=True)
+                location = location_elem.get_text(strip=True) if location_elem else ""
+                link = f"https://www.glassdoor.com{title_elem['href']}"
+                job_list.append({'title': title, 'company': company, 'location': location, 'link': link, 'source': 'Glassdoor'})
+        except Exception as e:
+            PARSE_FAILURES.inc(source="glassdoor")
+            log.debug("Error processing Glassdoor job card: %s", e)
+            continue
+    return job_list
+
+def parse_internshala(content, limit=MAX_CARDS):
+    job_list = []
+    for card in parse_cards(content, 'div', {'class': 'internship_details'}, limit):
+        try:
+            title_elem = card.find('a', class_='view_detail_button')
+            company_elem = card.find('a', class_='company_name')
+            location_elems = card.find_all('a', class_='location_link')
+            link = title_elem['href'] if title_elem else ""
+
+            if title_elem and company_elem and link:
+                title = title_elem.get_text(strip=True)
+                company = company_elem.get_text(strip=True)
+                location = ", ".join(elem.get_text(strip=True) for elem in location_elems)
+                if not link.startswith('http'):
+                    link = f"https://internshala.com{link}"
+                job_list.append({'title': title, 'company': company, 'location': location, 'link': link, 'source': 'Internshala'})
+        except Exception as e:
+            PARSE_FAILURES.inc(source="internshala")
+            log.debug("Error processing Internshala job card: %s", e)
+            continue
+    return job_list
+
+def parse_google(content):
+    job_list = []
+    for element in parse_cards(content, 'div', {'class': 'g'}):
+        try:
+            title_elem = element.find('h3')
+            link_elem = element.find('a')
+
+            if title_elem and link_elem:
+                title = title_elem.get_text(strip=True)
+                link = link_elem['href']
+                
+                if any(term in title.lower() for term in ['intern', 'internship', 'trainee']):
+                    company_elem = element.find('span', class_='b')
+                    company = company_elem.get_text(strip=True) if company_elem else "N/A"
+                    
+                    job_list.append({
+                        'title': title,
+                        'company': company,
+                        'link': link,
+                        'source': 'Google Search'
+                    })
+        except Exception as e:
+            PARSE_FAILURES.inc(source="google")
+            log.debug("Error parsing a Google search result: %s", e)
+            continue
+    return job_list
+
+## --- Requests-based Scrapers ---
+def scrape_indeed_basic(skills, location, page=1):
     """Basic Indeed scraping (your original function)"""
-    print(f"Starting Indeed basic scraping for skills: {skills}, location: {location}")
+    log.debug("Starting Indeed basic scraping for skills: %s, location: %s", skills, location)
     job_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    }
     search_query = "+".join([skill.strip() for skill in skills.split(',')])
     location_query = location.replace(' ', '+')
-    url = f"https://www.indeed.com/jobs?q={search_query}+internship&l={location_query}"
+    url = f"{INDEED_BASE_URL}/jobs?q={search_query}+internship&l={location_query}"
+    if page > 1:
+        url += f"&start={(page - 1) * MAX_CARDS}"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        job_cards = soup.find_all('div', {'data-jk': True})
-        
-        for card in job_cards[:10]:
-            try:
-                title_elem = card.find('h2', class_='jobTitle')
-                company_elem = card.find('span', class_='companyName')
-                link_elem = card.find('a', {'data-jk': True})
-                
-                if title_elem and company_elem and link_elem:
-                    title = title_elem.get_text(strip=True)
-                    company = company_elem.get_text(strip=True)
-                    link = f"https://www.indeed.com{link_elem['href']}"
-                    job_list.append({'title': title, 'company': company, 'link': link, 'source': 'Indeed'})
-            except Exception as e:
-                print(f"Error processing Indeed job card: {e}")
-                continue
+        job_list = parse_indeed(response.content)
     except requests.RequestException as e:
-        print(f"Request error while scraping Indeed: {e}")
+        log.warning("Request error while scraping Indeed: %s", e)
     
     return job_list
 
-def scrape_glassdoor(skills, location):
-    print(f"Starting Glassdoor scraping for skills: {skills}, location: {location}")
+def scrape_glassdoor(skills, location, page=1):
+    log.debug("Starting Glassdoor scraping for skills: %s, location: %s", skills, location)
     job_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    }
     search_query = "-".join([skill.strip() for skill in skills.split(',')])
     location_query = location.replace(' ', '-')
-    url = f"https://www.glassdoor.com/jobs/internship-{search_query}-jobs-in-{location_query}-SRCH_IL.0,14.html"
+    page_suffix = f"_IP{page}" if page > 1 else ""
+    url = f"{GLASSDOOR_BASE_URL}/jobs/internship-{search_query}-jobs-in-{location_query}-SRCH_IL.0,14{page_suffix}.html"
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        job_cards = soup.find_all('li', class_='react-job-listing')
-        
-        for card in job_cards[:10]:
-            try:
-                title_elem = card.find('a', {'data-test': 'job-link'})
-                company_elem = card.find('a', {'data-test': 'employer-link'})
-                
-                if title_elem and company_elem:
-                    title = title_elem.get_text(strip=True)
-                    company = company_elem.get_text(strip=True)
-                    link = f"https://www.glassdoor.com{title_elem['href']}"
-                    job_list.append({'title': title, 'company': company, 'link': link, 'source': 'Glassdoor'})
-            except Exception as e:
-                print(f"Error processing Glassdoor job card: {e}")
-                continue
+        job_list = parse_glassdoor(response.content, limit=None)
     except requests.RequestException as e:
-        print(f"Request error while scraping Glassdoor: {e}")
+        log.warning("Request error while scraping Glassdoor: %s", e)
     return job_list
 
-def scrape_internshala(skills, location):
-    print(f"Starting Internshala scraping for skills: {skills}, location: {location}")
+def scrape_internshala(skills, location, page=1):
+    log.debug("Starting Internshala scraping for skills: %s, location: %s", skills, location)
     job_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    }
     skill_query = "+".join([s.strip() for s in skills.split(',')])
     location_query = location.replace(' ', '-').lower()
-    url = f"https://internshala.com/internships/{location_query}-internship/{skill_query}"
+    url = f"{INTERNSHALA_BASE_URL}/internships/{location_query}-internship/{skill_query}"
+    if page > 1:
+        url += f"/page-{page}"
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        job_cards = soup.find_all('div', class_='internship_details')
-        
-        for card in job_cards[:10]:
-            try:
-                title_elem = card.find('a', class_='view_detail_button')
-                company_elem = card.find('a', class_='company_name')
-                link = title_elem['href'] if title_elem else ""
-
-                if title_elem and company_elem and link:
-                    title = title_elem.get_text(strip=True)
-                    company = company_elem.get_text(strip=True)
-                    if not link.startswith('http'):
-                        link = f"https://internshala.com{link}"
-                    job_list.append({'title': title, 'company': company, 'link': link, 'source': 'Internshala'})
-            except Exception as e:
-                print(f"Error processing Internshala job card: {e}")
-                continue
+        job_list = parse_internshala(response.content, limit=None)
     except requests.RequestException as e:
-        print(f"Request error while scraping Internshala: {e}")
+        log.warning("Request error while scraping Internshala: %s", e)
     return job_list
 
-def scrape_google(skills, location):
+def scrape_google(skills, location, page=1):
     """Scrape Google for jobs as a fallback"""
-    print(f"Starting Google search as a fallback for skills: {skills}, location: {location}")
+    log.debug("Starting Google search as a fallback for skills: %s, location: %s", skills, location)
     job_list = []
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    }
     search_query = f"internship {skills} in {location}"
-    url = f"https://www.google.com/search?q={search_query.replace(' ', '+')}&hl=en&gl=us"
+    url = f"{GOOGLE_BASE_URL}/search?q={search_query.replace(' ', '+')}&hl=en&gl=us"
+    if page > 1:
+        url += f"&start={(page - 1) * MAX_CARDS}"
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        job_elements = soup.find_all('div', class_='g')
-        for element in job_elements[:10]:
-            try:
-                title_elem = element.find('h3')
-                link_elem = element.find('a')
+        job_list = parse_google(response.content)
+    except requests.RequestException as e:
+        log.warning("Request error while scraping Google: %s", e)
+    
+    return job_list
 
-                if title_elem and link_elem:
-                    title = title_elem.get_text(strip=True)
-                    link = link_elem['href']
-                    
-                    if any(term in title.lower() for term in ['intern', 'internship', 'trainee']):
-                        company_elem = element.find('span', class_='b')
-                        company = company_elem.get_text(strip=True) if company_elem else "N/A"
-                        
-                        job_list.append({
-                            'title': title,
-                            'company': company,
-                            'link': link,
-                            'source': 'Google Search'
-                        })
+## --- Search Result Cache ---
+# Each source's results are cached under the canonical (skills, location) query.
+# Entries are fresh for the source's cache_ttl, then served stale for up to
+# RESULT_CACHE_STALE_SECONDS while a background scrape refreshes them.
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "2000"))
+RESULT_CACHE_STALE_SECONDS = float(os.environ.get("RESULT_CACHE_STALE_SECONDS", "21600"))
+RESULT_CACHE_URL = os.environ.get("RESULT_CACHE_URL")
+
+def canonical_skills(skills):
+    """'React, python,react ' -> 'python,react'"""
+    return ",".join(sorted({skill.strip().lower() for skill in (skills or "").split(",") if skill.strip()}))
+
+def normalize_location(location):
+    """' Mumbai,  India ' -> 'mumbai, india'"""
+    return " ".join((location or "").lower().split()).strip(" ,.")
+
+class MemoryCacheBackend:
+    """In-process LRU store bounded by entry count"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, ttl):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+class RedisCacheBackend:
+    """Store shared by every worker. Takes any client with redis-style get/set,
+    so tests can pass a local stand-in. Eviction is left to the server's
+    maxmemory LRU policy."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        raw = self.client.get(key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key, entry, ttl):
+        self.client.set(key, json.dumps(entry), ex=int(ttl))
+
+class ResultCache:
+    def __init__(self, backend, stale_seconds):
+        self.backend = backend
+        self.stale_seconds = stale_seconds
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, source, skills, location, page):
+        key = f"jobs:{source}:{canonical_skills(skills)}:{normalize_location(location)}"
+        return f"{key}:p{page}" if page > 1 else key
+
+    def lookup(self, source, skills, location, ttl, page=1):
+        """Return (jobs, state) where state is 'fresh', 'stale' or None on a miss"""
+        try:
+            entry = self.backend.get(self._key(source, skills, location, page))
+        except Exception as e:
+            log.error("Result cache read error: %s", e)
+            entry = None
+            with self.lock:
+                self.errors += 1
+
+        age = time.time() - entry["stored_at"] if entry else None
+        with self.lock:
+            if age is not None and age < ttl:
+                self.hits += 1
+                return entry["jobs"], "fresh"
+            if age is not None and age < ttl + self.stale_seconds:
+                self.stale_hits += 1
+                return entry["jobs"], "stale"
+            self.misses += 1
+            return None, None
+
+    def store(self, source, skills, location, jobs, ttl, page=1):
+        try:
+            self.backend.set(self._key(source, skills, location, page),
+                             {"jobs": jobs, "stored_at": time.time()},
+                             ttl + self.stale_seconds)
+        except Exception as e:
+            log.error("Result cache write error: %s", e)
+            with self.lock:
+                self.errors += 1
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0
+            }
+
+def create_cache_backend():
+    if RESULT_CACHE_URL:
+        try:
+            import redis
+            return RedisCacheBackend(redis.Redis.from_url(RESULT_CACHE_URL))
+        except Exception as e:
+            log.error("Error connecting to shared result cache: %s. Using in-process cache.", e)
+    return MemoryCacheBackend(RESULT_CACHE_MAX_ENTRIES)
+
+result_cache = ResultCache(create_cache_backend(), RESULT_CACHE_STALE_SECONDS)
+
+## --- Source Circuit Breakers ---
+# A source that keeps failing or coming back empty (blocked, or its markup
+# changed) is skipped for a cooldown instead of costing every search its
+# deadline. After the cooldown one search probes it; success closes the
+# breaker, another failure reopens it for twice as long. Each source's deadline
+# also shrinks to a multiple of its observed p95 latency once enough scrapes
+# have completed. State is kept per worker process.
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.environ.get("BREAKER_COOLDOWN_SECONDS", "120"))
+BREAKER_MAX_COOLDOWN_SECONDS = float(os.environ.get("BREAKER_MAX_COOLDOWN_SECONDS", "1800"))
+ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.environ.get("ADAPTIVE_TIMEOUT_MULTIPLIER", "2"))
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.environ.get("ADAPTIVE_TIMEOUT_MIN_SAMPLES", "20"))
+ADAPTIVE_TIMEOUT_FLOOR = float(os.environ.get("ADAPTIVE_TIMEOUT_FLOOR", "3"))
+
+BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+BREAKER_STATE = Gauge("ducky_source_breaker_state", "Source breaker state: 0 closed, 1 half-open, 2 open", ("source",))
+
+class SourceBreaker:
+    """Failure tracking, circuit breaker and latency-based deadline for one source"""
+
+    def __init__(self, name):
+        self.name = name
+        self.state = "closed"
+        self.failures = 0
+        self.cooldown = BREAKER_COOLDOWN_SECONDS
+        self.opened_at = 0.0
+        self.probe_started = None
+        self.latencies = deque(maxlen=100)
+        self.skipped = 0
+        self.lock = threading.Lock()
+        BREAKER_STATE.set(0, source=name)
+
+    def _set_state(self, state):
+        if state != self.state:
+            log.warning("%s breaker %s -> %s", self.name, self.state, state)
+            self.state = state
+            BREAKER_STATE.set(BREAKER_STATES[state], source=self.name)
+
+    def allow(self):
+        """Return True if a scrape may run now, claiming the probe when half-open"""
+        now = time.monotonic()
+        with self.lock:
+            if self.state == "closed":
+                return True
+            # A probe whose result never came back (abandoned search) frees the slot after a cooldown
+            probe_due = (now - self.opened_at >= self.cooldown if self.state == "open"
+                         else now - self.probe_started >= self.cooldown)
+            if probe_due:
+                self._set_state("half_open")
+                self.probe_started = now
+                return True
+            self.skipped += 1
+            return False
+
+    def record(self, outcome, elapsed=None):
+        """Record how a scrape ended: ok, empty, error or timeout"""
+        with self.lock:
+            if outcome == "ok":
+                self.failures = 0
+                self.cooldown = BREAKER_COOLDOWN_SECONDS
+                if elapsed is not None:
+                    self.latencies.append(elapsed)
+                self._set_state("closed")
+                return
+
+            self.failures += 1
+            if self.state == "half_open":
+                self.cooldown = min(self.cooldown * 2, BREAKER_MAX_COOLDOWN_SECONDS)
+            if self.state == "half_open" or self.failures >= BREAKER_FAILURE_THRESHOLD:
+                self.opened_at = time.monotonic()
+                self._set_state("open")
+
+    def _percentile(self, fraction):
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+    def deadline(self, default):
+        """The source's deadline, tightened to its observed latency when there is enough history"""
+        with self.lock:
+            if len(self.latencies) < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+                return default
+            adaptive = self._percentile(0.95) * ADAPTIVE_TIMEOUT_MULTIPLIER
+        return min(default, max(adaptive, ADAPTIVE_TIMEOUT_FLOOR))
+
+    def stats(self, default_deadline):
+        deadline = self.deadline(default_deadline)
+        with self.lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "skipped": self.skipped,
+                "retry_in_seconds": round(max(self.opened_at + self.cooldown - time.monotonic(), 0), 1) if self.state == "open" else None,
+                "p50_seconds": round(self._percentile(0.5), 2) if self.latencies else None,
+                "p95_seconds": round(self._percentile(0.95), 2) if self.latencies else None,
+                "deadline_seconds": round(deadline, 1)
+            }
+
+## --- Concurrent Source Fan-out ---
+# Every source runs in parallel with its own deadline (seconds) and the whole
+# search shares one overall budget. Whatever finished in time is returned.
+SCRAPE_BUDGET_SECONDS = float(os.environ.get("SCRAPE_BUDGET_SECONDS", "40"))
+GOOGLE_HEDGE_DELAY = float(os.environ.get("GOOGLE_HEDGE_DELAY", "6"))
+
+PRIMARY_SOURCES = [
+    {"name": "linkedin", "scraper": scrape_linkedin_with_selenium, "deadline": 40, "cache_ttl": 1800},
+    {"name": "indeed", "scraper": scrape_indeed_with_selenium, "deadline": 30, "cache_ttl": 1800},
+    {"name": "glassdoor", "scraper": scrape_glassdoor, "deadline": 15, "cache_ttl": 3600},
+    {"name": "internshala", "scraper": scrape_internshala, "deadline": 15, "cache_ttl": 3600},
+]
+FALLBACK_SOURCE = {"name": "google", "scraper": scrape_google, "deadline": 15, "cache_ttl": 3600}
+ALL_SOURCES = PRIMARY_SOURCES + [FALLBACK_SOURCE]
+
+source_breakers = {source["name"]: SourceBreaker(source["name"]) for source in ALL_SOURCES}
+
+def breaker_stats():
+    return {source["name"]: source_breakers[source["name"]].stats(source["deadline"]) for source in ALL_SOURCES}
+
+scrape_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("SCRAPE_WORKERS", "16")),
+    thread_name_prefix="scrape"
+)
+QUEUED_POLL_SECONDS = 0.25
+
+def _run_source(started, scraper, *args):
+    # A source's deadline starts when its scraper does, not while it sits in the executor queue
+    started.append(time.monotonic())
+    return scraper(*args)
+
+def iter_source_results(skills, location, budget=None, page=1):
+    """Run all sources concurrently and yield (source, jobs, elapsed) as each one finishes.
+
+    Sources that miss their own deadline (counted from when their scraper starts)
+    or the overall budget are dropped, and sources whose breaker is open are
+    skipped unless their results are cached. Only page 1 feeds the breakers: a
+    later page coming back empty usually means the listings ran out.
+    Google starts as a hedge once the primary sources look empty (nothing found
+    after GOOGLE_HEDGE_DELAY, or every primary already finished empty), and its
+    results are only used while the primaries have found nothing.
+    """
+    started = time.monotonic()
+    budget_end = started + (budget or SCRAPE_BUDGET_SECONDS)
+    pending = {}
+    cached = []
+    record_breaker = page == 1
+
+    def start(source):
+        jobs, state = result_cache.lookup(source["name"], skills, location, source["cache_ttl"], page)
+        if state:
+            if state == "stale":
+                refresh_in_background(source, skills, location, page)
+            cached.append((source, jobs))
+            return
+        breaker = source_breakers[source["name"]]
+        if not (breaker.allow() if record_breaker else breaker.state == "closed"):
+            log.debug("Skipping %s, its breaker is open", source["name"])
+            return
+        started_at = []
+        future = scrape_executor.submit(_run_source, started_at, source["scraper"], skills, location, page)
+        pending[future] = (source, started_at, breaker.deadline(source["deadline"]))
+
+    def deadline_of(started_at, deadline):
+        # Not started yet: only the overall budget applies
+        return min(started_at[0] + deadline, budget_end) if started_at else budget_end
+
+    for source in PRIMARY_SOURCES:
+        start(source)
+
+    hedge_started = False
+    found_any = False
+    while True:
+        while cached:
+            source, jobs = cached.pop(0)
+            if source is FALLBACK_SOURCE and found_any:
+                continue
+            found_any = found_any or bool(jobs)
+            yield source["name"], jobs, 0.0
+
+        now = time.monotonic()
+        for future, (source, started_at, deadline) in list(pending.items()):
+            if now >= deadline_of(started_at, deadline) and not future.done():
+                del pending[future]
+                if future.cancel():
+                    # Still queued behind other scrapes, so this says nothing about the source
+                    log.warning("%s never started before the search budget ran out", source['name'])
+                    continue
+                # cancel() fails once the future is running, which can be just before _run_source records its start
+                elapsed = now - started_at[0] if started_at else 0.0
+                SCRAPE_SECONDS.observe(elapsed, source=source["name"], outcome="timeout")
+                if record_breaker and started_at and now >= started_at[0] + deadline:
+                    # Only the source's own deadline counts against it, not the search running out of budget
+                    source_breakers[source["name"]].record("timeout")
+                log.warning("%s missed its deadline, dropping its results", source['name'])
+
+        primaries_pending = any(source is not FALLBACK_SOURCE for source, _, _ in pending.values())
+        if (not hedge_started and not found_any and now < budget_end
+                and (not primaries_pending or now - started >= GOOGLE_HEDGE_DELAY)):
+            log.info("Primary sources look empty. Starting Google search as a hedge...")
+            start(FALLBACK_SOURCE)
+            hedge_started = True
+
+        if cached:
+            continue
+        if not pending:
+            break
+
+        wake_at = min(deadline_of(started_at, deadline) for _, started_at, deadline in pending.values())
+        if any(not started_at for _, started_at, _ in pending.values()):
+            wake_at = min(wake_at, now + QUEUED_POLL_SECONDS)
+        if not hedge_started:
+            wake_at = min(wake_at, started + GOOGLE_HEDGE_DELAY)
+        done, _ = wait(list(pending), timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            source, started_at, _ = pending.pop(future)
+            elapsed = time.monotonic() - started_at[0]
+            try:
+                jobs = future.result()
+                outcome = "ok" if jobs else "empty"
             except Exception as e:
-                print(f"Error parsing a Google search result: {e}")
+                log.error("Error in %s scraper: %s", source['name'], e)
+                jobs = []
+                outcome = "error"
+            SCRAPE_SECONDS.observe(elapsed, source=source["name"], outcome=outcome)
+            if record_breaker:
+                source_breakers[source["name"]].record(outcome, elapsed)
+            SCRAPE_CARDS.inc(len(jobs), source=source["name"])
+            if jobs:
+                result_cache.store(source["name"], skills, location, jobs, source["cache_ttl"], page)
+
+            if source is FALLBACK_SOURCE and found_any:
                 continue
+            if jobs:
+                found_any = True
+            yield source["name"], jobs, elapsed
 
-    except requests.RequestException as e:
-        print(f"Request error while scraping Google: {e}")
-    
-    return job_list
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def refresh_in_background(source, skills, location, page=1):
+    """Re-scrape one source for a stale cache entry, at most once at a time per query"""
+    key = (source["name"], canonical_skills(skills), normalize_location(location), page)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    breaker = source_breakers[source["name"]]
+    record_breaker = page == 1
+    if not (breaker.allow() if record_breaker else breaker.state == "closed"):
+        with _refreshing_lock:
+            _refreshing.discard(key)
+        return
+
+    def refresh():
+        started = time.monotonic()
+        try:
+            jobs = source["scraper"](skills, location, page)
+            if record_breaker:
+                breaker.record("ok" if jobs else "empty", time.monotonic() - started)
+            if jobs:
+                result_cache.store(source["name"], skills, location, jobs, source["cache_ttl"], page)
+        except Exception as e:
+            if record_breaker:
+                breaker.record("error")
+            log.error("Error refreshing %s results: %s", source['name'], e)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    scrape_executor.submit(refresh)
+
+## --- Single-flight Coalescing ---
+# Identical searches that arrive while one is already running (a campus batch
+# signing up together) wait on that execution instead of starting their own.
+# The shared search runs on its own executor, so a waiter timing out never
+# cancels it for the others, and its results still reach the cache and index.
+# Background searches (task workers, crawler, matcher, batches) get a separate
+# executor so they can never leave a request queued where admission can't see it.
+SEARCH_WAIT_GRACE = float(os.environ.get("SEARCH_WAIT_GRACE", "5"))
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution"""
+
+    def __init__(self, executor, background_executor):
+        self.executor = executor
+        self.background_executor = background_executor
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key, func, timeout=None, background=False):
+        """Run func once per key at a time and return its result to every caller.
+
+        Raises TimeoutError if this caller gives up first; the shared call keeps
+        running for the remaining waiters.
+        """
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = (self.background_executor if background else self.executor).submit(func)
+                self.calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if leader:
+            # Outside the lock: the callback runs right away if func already finished
+            future.add_done_callback(lambda _: self._forget(key, future))
+        try:
+            return future.result(timeout)
+        except FuturesTimeoutError:
+            with self.lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Gave up waiting for shared search {key}")
+
+    def in_flight(self, key):
+        with self.lock:
+            return key in self.calls
+
+    def _forget(self, key, future):
+        with self.lock:
+            if self.calls.get(key) is future:
+                del self.calls[key]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "in_flight": len(self.calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts
+            }
+
+search_flights = SingleFlight(
+    ThreadPoolExecutor(max_workers=int(os.environ.get("SEARCH_WORKERS", "8")), thread_name_prefix="search"),
+    ThreadPoolExecutor(max_workers=int(os.environ.get("SEARCH_BACKGROUND_WORKERS", "8")), thread_name_prefix="search_bg")
+)
+
+def run_scrapers(skills, location, budget=None, page=1, wait=None):
+    """Fan out to every source and return the deduplicated job list in source order.
+
+    `page` asks each source for a later page of its listings. Concurrent calls
+    for the same canonical query and page share one execution, and only that
+    execution takes an admission slot. `wait` is how long a request may wait
+    for the slot (raising Overloaded after); background callers leave it unset.
+    """
+    return search_sources(skills, location, budget, page, wait)[0]
+
+def search_sources(skills, location, budget=None, page=1, wait=None):
+    """Like run_scrapers, but returns (jobs, complete) where complete says every
+    primary source answered, rather than timing out or being skipped"""
+    budget = budget or SCRAPE_BUDGET_SECONDS
+    key = (canonical_skills(skills), normalize_location(location), page)
+    if wait is not None and not search_flights.in_flight(key):
+        # Turn the request away up front rather than after it queues for an executor thread
+        admission.check()
+    # Background callers may queue for a slot indefinitely, so they wait on the result the same way
+    timeout = budget + SEARCH_WAIT_GRACE + wait if wait is not None else None
+    while True:
+        try:
+            jobs, complete = search_flights.do(key, lambda: _run_scrapers(skills, location, budget, page, wait),
+                                               timeout, background=wait is None)
+            return list(jobs), complete
+        except TimeoutError as e:
+            log.warning("%s", e)
+            raise Overloaded(503, admission.retry_after(admission.waiting),
+                             "Timed out waiting for search results. Please try again shortly.")
+        except Overloaded:
+            if wait is not None:
+                raise
+            # The shared execution belonged to a request that was turned away;
+            # background work runs it again (becoming the leader) instead of failing
+
+def _run_scrapers(skills, location, budget, page=1, wait=None):
+    with admission.slot(wait=wait):
+        return _scrape_all(skills, location, budget, page)
+
+def _scrape_all(skills, location, budget, page):
+    results = {}
+    for source, jobs, elapsed in iter_source_results(skills, location, budget, page):
+        log.info("%s returned %s jobs in %.2fs", source, len(jobs), elapsed,
+                 extra={"source": source, "cards": len(jobs), "elapsed": round(elapsed, 3)})
+        results[source] = jobs
+
+    complete = all(source["name"] in results for source in PRIMARY_SOURCES)
+    primary_jobs = [job for source in PRIMARY_SOURCES for job in results.get(source["name"], [])]
+    if primary_jobs:
+        return dedupe_jobs(primary_jobs), complete
+    return dedupe_jobs(results.get(FALLBACK_SOURCE["name"], [])), complete
+
+## --- Merge, Dedupe and Rank ---
+# LinkedIn and Indeed often list the same posting and Google returns aggregator
+# copies, so merged results are deduplicated on canonical links and on
+# (title, company), then ranked against the candidate's profile.
+TRACKING_PARAMS = {"trk", "trackingid", "refid", "from", "vjs", "tk", "sa", "ved", "usg", "ei", "position", "pagenum"}
+COMPANY_SUFFIXES = {"pvt", "private", "ltd", "limited", "inc", "llc", "llp", "corp", "corporation", "co"}
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+SKILL_WEIGHT = 3
+ROLE_WEIGHT = 2
+LOCATION_WEIGHT = 1
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+def canonical_link(link):
+    """Drop tracking parameters, fragments and host/trailing-slash differences.
+    Google /url?q= redirects are unwrapped to the page they point at."""
+    parts = urlsplit((link or "").strip())
+    params = parse_qsl(parts.query)
+    if parts.path == "/url":
+        target = dict(params).get("q")
+        if target:
+            return canonical_link(target)
+    kept = sorted((key, value) for key, value in params
+                  if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_"))
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}?{urlencode(kept)}" if kept else f"{host}{parts.path.rstrip('/')}"
+
+def canonical_title(title):
+    return " ".join(tokenize(title))
+
+def canonical_company(company):
+    tokens = tokenize(company)
+    while tokens and tokens[-1] in COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+class JobDeduplicator:
+    """Hash index over canonical links and (title, company) pairs seen so far"""
+
+    def __init__(self):
+        self.seen = set()
+
+    def add(self, job):
+        """Record a job and return False if it duplicates one already added"""
+        keys = [("link", canonical_link(job.get('link')))]
+        company = canonical_company(job.get('company'))
+        if company and company != "n a":
+            keys.append(("posting", canonical_title(job.get('title')), company))
+        if any(key in self.seen for key in keys):
+            return False
+        self.seen.update(keys)
+        return True
+
+def dedupe_jobs(jobs):
+    """Keep the first copy of each posting, so earlier (preferred) sources win"""
+    deduplicator = JobDeduplicator()
+    return [job for job in jobs if deduplicator.add(job)]
+
+def build_profile_index(skills, preferred_role=None):
+    """Token -> weight lookup built once per search"""
+    index = {}
+    for text, weight in ((preferred_role, ROLE_WEIGHT), (skills, SKILL_WEIGHT)):
+        for token in tokenize(text):
+            index[token] = max(index.get(token, 0), weight)
+    return index
+
+def rank_jobs(jobs, skills, location=None, preferred_role=None):
+    """Order jobs by how well they match the profile, keeping source order on ties.
+    Location only scores against the posting's location, where the source gives one."""
+    index = build_profile_index(skills, preferred_role=preferred_role)
+    location_tokens = set(tokenize(location))
+    scores = [sum(index.get(token, 0) for token in set(tokenize(f"{job.get('title')} {job.get('company')}")))
+              + LOCATION_WEIGHT * bool(location_tokens & set(tokenize(job.get('location'))))
+              for job in jobs]
+    order = sorted(range(len(jobs)), key=lambda i: -scores[i])
+    return [jobs[i] for i in order]
 
 ## --- SMS Sender Function ---
-def send_sms(to_number, message_body):
-    if not twilio_client or not twilio_number:
-        print("Twilio not configured. SMS will not be sent.")
-        return False
-    try:
-        if not to_number.startswith('+'):
-            to_number = f"+91{to_number}"
-        message = twilio_client.messages.create(
-            to=to_number,
-            from_=twilio_number,
-            body=message_body[:1600]
-        )
-        print(f"SMS sent successfully. SID: {message.sid}")
+def normalize_phone(number):
+    number = "".join((number or "").split())
+    return number if number.startswith('+') else f"+91{number}"
+
+# Only this many jobs are listed in a message, so only they count as notified
+SMS_LISTED_JOBS = 3
+
+def format_job_sms(name, jobs, new=False):
+    kind = "new internship opportunities" if new else "internship opportunities"
+    job_summary = f"Hello {name}! We found {len(jobs)} {kind} for you.\n\n"
+    for i, job in enumerate(jobs[:SMS_LISTED_JOBS], 1):
+        job_summary += f"{i}. {job['title']} at {job['company']}\n"
+    job_summary += f"\nCheck your email for more details!"
+    return job_summary
+
+SMS_TRANSPORT = os.environ.get("SMS_TRANSPORT", "twilio")
+
+class TwilioTransport:
+    def configured(self):
+        return bool((twilio_client or (twilio_sid and twilio_token)) and twilio_number)
+
+    def send(self, to_number, body):
+        """Send one message and return its SID"""
+        return get_twilio_client().messages.create(to=to_number, from_=twilio_number, body=body).sid
+
+class LocalSmsTransport:
+    """Records messages instead of sending them, for local runs and tests"""
+
+    def __init__(self):
+        self.sent = []
+
+    def configured(self):
         return True
-    except Exception as e:
-        print(f"Error sending SMS: {e}")
-        return False
+
+    def send(self, to_number, body):
+        self.sent.append({"to": to_number, "body": body})
+        return f"LOCAL{len(self.sent):06d}"
+
+def create_sms_transport():
+    return LocalSmsTransport() if SMS_TRANSPORT == "local" else TwilioTransport()
 
 ## --- Enhanced Database Storage ---
+def validate_profile(data):
+    """Return why a submitted profile is unusable, or None if it is valid"""
+    if not data:
+        return "No data provided"
+    required = ('name', 'email', 'techStacks', 'location')
+    if not all(data.get(field) for field in required):
+        return "Missing required fields"
+    for field in required + ('phone', 'city'):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return f"Field {field} must be a string"
+    return None
+
 def store_candidate_data(data):
-    """Store candidate data in Supabase with better error handling"""
-    if not supabase:
-        print("Supabase not configured. Skipping database storage.")
+    """Queue the candidate row for the next bulk insert into Supabase"""
+    return store_candidates([data])
+
+def store_candidates(profiles):
+    """Queue candidate rows for the next bulk insert into Supabase"""
+    if not (supabase_url and supabase_key) and supabase is None:
+        log.warning("Supabase not configured. Skipping database storage.")
         return False
-    
+
+    candidate_writer.add_many([candidate_row(data) for data in profiles])
+    return True
+
+def candidate_row(data):
+    return {
+        "name": data.get('name'),
+        "email": data.get('email'),
+        "phone_number": data.get('phone'),
+        "tech_stacks": data.get('techStacks'),
+        "location": data.get('location'),
+        "city": data.get('city'),
+        "project_details": data.get('projectDetails'),
+        "experience": data.get('experience'),
+        "preferred_role": data.get('preferredRole'),
+        "sms_notifications": data.get('smsNotifications', False)
+    }
+
+## --- Local SQLite Store ---
+# Nothing touches the database at import. Subsystems register their tables with
+# local_schema() and init_local_store() creates them on the first connection in
+# each process, so a preloading gunicorn master never opens the file and no
+# connection is ever inherited across a fork.
+LOCAL_DB_PATH = os.environ.get("LOCAL_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "ducky.db"))
+LOCAL_SCHEMA = []
+_db_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_pid = None
+
+def local_schema(*statements):
+    """Register DDL for init_local_store(): SQL strings, or callables taking the connection"""
+    LOCAL_SCHEMA.extend(statements)
+
+def add_column(table, column, definition):
+    """Schema step adding a column to a table created before the column existed"""
+    def migrate(db):
+        if column not in {row["name"] for row in db.execute(f"PRAGMA table_info({table})")}:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return migrate
+
+def init_local_store(conn):
+    """Create the registered tables, once per process"""
+    global _schema_pid
+    with _schema_lock:
+        if _schema_pid == os.getpid():
+            return
+        for statement in LOCAL_SCHEMA:
+            statement(conn) if callable(statement) else conn.execute(statement)
+        _schema_pid = os.getpid()
+
+def local_db():
+    """Per-thread autocommit connection to the local SQLite store.
+    Connections are never shared across a fork, a forked worker opens its own."""
+    conn = getattr(_db_local, "conn", None)
+    if conn is None or _db_local.pid != os.getpid():
+        conn = sqlite3.connect(LOCAL_DB_PATH, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        init_local_store(conn)
+        _db_local.conn = conn
+        _db_local.pid = os.getpid()
+    return conn
+
+local_schema("CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+def claim_lease(name, ttl):
+    """Return True if this process holds the named lease, so periodic jobs that
+    every gunicorn worker registers only run in one of them at a time"""
+    now = time.time()
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    db = local_db()
+    db.execute("INSERT OR IGNORE INTO leases (name, holder, expires_at) VALUES (?, '', 0)", (name,))
+    cursor = db.execute("UPDATE leases SET holder = ?, expires_at = ? WHERE name = ? AND (expires_at < ? OR holder = ?)",
+                        (holder, now + ttl, name, now, holder))
+    return cursor.rowcount == 1
+
+## --- Candidate Write-behind ---
+# Candidate rows are buffered and inserted into Supabase in bulk once
+# CANDIDATE_BATCH_SIZE rows are waiting or every CANDIDATE_FLUSH_INTERVAL
+# seconds. Batches that still fail after retries are spilled to the local
+# SQLite store and replayed on a later flush, so nothing is lost while
+# Supabase is unreachable. Spilled rows are leased while they are replayed and
+# only deleted once written, and a lease left by a worker that died mid-flush
+# expires after CANDIDATE_SPILL_LEASE_SECONDS. Rows Supabase rejects outright (constraint or type
+# errors) would fail every replay, so a rejected batch is bisected and the bad
+# rows are moved to a dead-letter table instead.
+CANDIDATE_BATCH_SIZE = int(os.environ.get("CANDIDATE_BATCH_SIZE", "50"))
+CANDIDATE_FLUSH_INTERVAL = float(os.environ.get("CANDIDATE_FLUSH_INTERVAL", "2"))
+CANDIDATE_FLUSH_RETRIES = int(os.environ.get("CANDIDATE_FLUSH_RETRIES", "3"))
+CANDIDATE_SPILL_LEASE_SECONDS = float(os.environ.get("CANDIDATE_SPILL_LEASE_SECONDS", "300"))
+# Postgres SQLSTATE classes for bad data (22), constraint violations (23) and
+# unknown columns/types (42), plus PostgREST's request errors: retrying won't help
+PERMANENT_ERROR_PREFIXES = ("22", "23", "42", "PGRST1", "PGRST2")
+
+def is_permanent_insert_error(e):
+    return str(getattr(e, "code", None) or "").startswith(PERMANENT_ERROR_PREFIXES)
+
+local_schema("""CREATE TABLE IF NOT EXISTS candidate_spill (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    row TEXT NOT NULL,
+    spilled_at REAL NOT NULL,
+    claimed_at REAL
+)""", add_column("candidate_spill", "claimed_at", "REAL"))
+local_schema("""CREATE TABLE IF NOT EXISTS candidate_dead_letter (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    row TEXT NOT NULL,
+    error TEXT NOT NULL,
+    failed_at REAL NOT NULL
+)""")
+
+class CandidateWriter:
+    """Write-behind buffer for inserts into the candidates table"""
+
+    def __init__(self, batch_size, retries):
+        self.batch_size = batch_size
+        self.retries = retries
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.written = 0
+        self.spilled = 0
+        self.dead_lettered = 0
+        self.failed_flushes = 0
+
+    def add_many(self, rows):
+        with self.lock:
+            self.buffer.extend(rows)
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.wakeup.set()
+
+    def add(self, row):
+        self.add_many([row])
+
+    def _insert(self, rows):
+        client = get_supabase()
+        if not client:
+            raise RuntimeError("Supabase client unavailable")
+        for attempt in range(self.retries):
+            try:
+                with DB_SECONDS.time(operation="candidates_insert"):
+                    client.table("candidates").insert(rows).execute()
+                return
+            except Exception as e:
+                if attempt == self.retries - 1 or is_permanent_insert_error(e):
+                    raise
+                log.warning("Candidate insert failed (%s), retrying", e)
+                time.sleep(0.5 * 2 ** attempt + random.uniform(0, 0.5))
+
+    def _spill(self, rows):
+        now = time.time()
+        local_db().executemany("INSERT INTO candidate_spill (row, spilled_at) VALUES (?, ?)",
+                               [(json.dumps(row), now) for row in rows])
+        with self.lock:
+            self.spilled += len(rows)
+
+    def _dead_letter(self, row, error):
+        log.error("Supabase rejected a candidate row, moving it to the dead-letter table: %s", error)
+        local_db().execute("INSERT INTO candidate_dead_letter (row, error, failed_at) VALUES (?, ?, ?)",
+                           (json.dumps(row), str(error), time.time()))
+        with self.lock:
+            self.dead_lettered += 1
+
+    def _write(self, rows):
+        """Insert rows, bisecting around any Supabase rejects outright. Returns the
+        rows a transient failure left unwritten."""
+        try:
+            self._insert(rows)
+        except Exception as e:
+            if not is_permanent_insert_error(e):
+                log.warning("Candidate insert failed: %s", e)
+                return rows
+            if len(rows) == 1:
+                self._dead_letter(rows[0], e)
+                return []
+            middle = len(rows) // 2
+            unwritten = self._write(rows[:middle])
+            return unwritten + rows[middle:] if unwritten else self._write(rows[middle:])
+        with self.lock:
+            self.written += len(rows)
+        return []
+
+    def _claim_spilled(self):
+        """Lease a batch of spilled rows and return [(id, row)]"""
+        # UPDATE ... RETURNING leases rows atomically, so two workers never replay the same ones
+        now = time.time()
+        cursor = local_db().execute("""UPDATE candidate_spill SET claimed_at = ?
+                                       WHERE id IN (SELECT id FROM candidate_spill WHERE claimed_at IS NULL OR claimed_at < ?
+                                                    ORDER BY id LIMIT ?)
+                                       RETURNING id, row""", (now, now - CANDIDATE_SPILL_LEASE_SECONDS, self.batch_size))
+        return [(spill_id, json.loads(row)) for spill_id, row in cursor.fetchall()]
+
+    def _settle_spilled(self, claimed, unwritten):
+        """Delete the leased rows that were written or dead-lettered and release the rest"""
+        left = {id(row) for row in unwritten}
+        db = local_db()
+        db.executemany("DELETE FROM candidate_spill WHERE id = ?", [(spill_id,) for spill_id, row in claimed if id(row) not in left])
+        db.executemany("UPDATE candidate_spill SET claimed_at = NULL WHERE id = ?", [(spill_id,) for spill_id, row in claimed if id(row) in left])
+
+    def flush(self):
+        with self.lock:
+            rows, self.buffer = self.buffer, []
+        claimed = self._claim_spilled()
+        if claimed:
+            unwritten = self._write([row for _, row in claimed])
+            self._settle_spilled(claimed, unwritten)
+            if unwritten:
+                # Supabase is still failing, so new rows go behind the spilled ones
+                if rows:
+                    self._spill(rows)
+                with self.lock:
+                    self.failed_flushes += 1
+                return
+
+        for start in range(0, len(rows), self.batch_size):
+            end = start + self.batch_size
+            unwritten = self._write(rows[start:end])
+            if unwritten:
+                log.warning("Spilling %s candidate rows locally", len(unwritten) + len(rows[end:]))
+                self._spill(unwritten + rows[end:])
+                with self.lock:
+                    self.failed_flushes += 1
+                return
+
+    def spill_depth(self):
+        return local_db().execute("SELECT COUNT(*) FROM candidate_spill").fetchone()[0]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "buffered": len(self.buffer),
+                "written": self.written,
+                "spilled": self.spilled,
+                "dead_lettered": self.dead_lettered,
+                "failed_flushes": self.failed_flushes
+            }
+
+candidate_writer = CandidateWriter(CANDIDATE_BATCH_SIZE, CANDIDATE_FLUSH_RETRIES)
+atexit.register(candidate_writer.flush)
+
+@background_task(0)
+def flush_candidate_writes():
+    candidate_writer.wakeup.wait(CANDIDATE_FLUSH_INTERVAL)
+    candidate_writer.wakeup.clear()
+    candidate_writer.flush()
+
+## --- SMS Dispatch Queue ---
+# Requests only enqueue SMS. A worker pool drains the SQLite outbox through a
+# token bucket matching our Twilio throughput (per process, so divide the
+# account limit by the number of gunicorn workers) and retries failures with
+# exponential backoff. The idempotency key makes re-enqueueing the same
+# message a no-op; without an explicit key, the same text to the same number
+# is deduplicated only within SMS_DEDUPE_WINDOW_SECONDS. Every message keeps
+# its delivery status until it is purged after SMS_RETENTION_DAYS.
+SMS_WORKERS = int(os.environ.get("SMS_WORKERS", "2"))
+SMS_RATE_PER_SECOND = float(os.environ.get("SMS_RATE_PER_SECOND", "1"))
+SMS_BURST = int(os.environ.get("SMS_BURST", "5"))
+SMS_MAX_ATTEMPTS = int(os.environ.get("SMS_MAX_ATTEMPTS", "5"))
+SMS_RETRY_BASE_SECONDS = float(os.environ.get("SMS_RETRY_BASE_SECONDS", "5"))
+SMS_DEDUPE_WINDOW_SECONDS = int(os.environ.get("SMS_DEDUPE_WINDOW_SECONDS", "900"))
+SMS_RETENTION_DAYS = float(os.environ.get("SMS_RETENTION_DAYS", "7"))
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = (1 - self.tokens) / self.rate
+            time.sleep(wait_for)
+
+local_schema("""CREATE TABLE IF NOT EXISTS sms_outbox (
+    id TEXT PRIMARY KEY,
+    to_number TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    sid TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)""", "CREATE INDEX IF NOT EXISTS sms_outbox_due ON sms_outbox (status, next_attempt_at)")
+
+class SmsOutbox:
+    def __init__(self, transport, bucket, max_attempts):
+        self.transport = transport
+        self.bucket = bucket
+        self.max_attempts = max_attempts
+        self.wakeup = threading.Event()
+
+    def enqueue(self, to_number, body, idempotency_key=None):
+        """Queue a message and return its key, or None if the key was already queued"""
+        to_number = normalize_phone(to_number)
+        body = body[:1600]
+        now = time.time()
+        window = int(now // SMS_DEDUPE_WINDOW_SECONDS)
+        key = idempotency_key or hashlib.sha256(f"{to_number}\n{body}\n{window}".encode()).hexdigest()
+        inserted = local_db().execute("""INSERT OR IGNORE INTO sms_outbox (id, to_number, body, status, next_attempt_at, created_at, updated_at)
+                                         VALUES (?, ?, ?, 'queued', ?, ?, ?)""", (key, to_number, body, now, now, now)).rowcount
+        if not inserted:
+            return None
+        self.wakeup.set()
+        return key
+
+    def claim(self):
+        now = time.time()
+        db = local_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("""SELECT * FROM sms_outbox WHERE status = 'queued' AND next_attempt_at <= ?
+                                ORDER BY next_attempt_at LIMIT 1""", (now,)).fetchone()
+            if row:
+                db.execute("UPDATE sms_outbox SET status = 'sending', updated_at = ? WHERE id = ?", (now, row["id"]))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return row
+
+    def dispatch_next(self):
+        message = self.claim()
+        if not message:
+            self.wakeup.wait(1)
+            self.wakeup.clear()
+            return
+
+        self.bucket.acquire()
+        attempts = message["attempts"] + 1
+        try:
+            with SMS_SECONDS.time():
+                sid = self.transport.send(message["to_number"], message["body"])
+        except Exception as e:
+            final = attempts >= self.max_attempts
+            delay = SMS_RETRY_BASE_SECONDS * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+            log.warning("Error sending SMS %s (attempt %s): %s", message['id'][:8], attempts, e)
+            local_db().execute("""UPDATE sms_outbox SET status = ?, attempts = ?, next_attempt_at = ?, error = ?, updated_at = ?
+                                  WHERE id = ?""", ("failed" if final else "queued", attempts, time.time() + delay,
+                                                    str(e), time.time(), message["id"]))
+            return
+
+        log.info("SMS sent successfully. SID: %s", sid)
+        local_db().execute("UPDATE sms_outbox SET status = 'sent', attempts = ?, sid = ?, error = NULL, updated_at = ? WHERE id = ?",
+                           (attempts, sid, time.time(), message["id"]))
+
+    def requeue_stale(self, older_than):
+        local_db().execute("UPDATE sms_outbox SET status = 'queued' WHERE status = 'sending' AND updated_at < ?",
+                           (time.time() - older_than,))
+
+    def purge(self, older_than):
+        """Drop delivered and failed messages last touched before the cutoff"""
+        return local_db().execute("DELETE FROM sms_outbox WHERE status IN ('sent', 'failed') AND updated_at < ?",
+                                  (time.time() - older_than,)).rowcount
+
+    def status(self, key):
+        row = local_db().execute("SELECT id, status, attempts, sid, error, created_at, updated_at FROM sms_outbox WHERE id = ?",
+                                 (key,)).fetchone()
+        return dict(row) if row else None
+
+    def stats(self):
+        counts = dict(local_db().execute("SELECT status, COUNT(*) FROM sms_outbox GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in ("queued", "sending", "sent", "failed")}
+
+sms_outbox = SmsOutbox(create_sms_transport(), TokenBucket(SMS_RATE_PER_SECOND, SMS_BURST), SMS_MAX_ATTEMPTS)
+
+def queue_sms(to_number, message_body, idempotency_key=None):
+    """Queue an SMS for background delivery and return True if it was newly queued"""
+    if not sms_outbox.transport.configured():
+        log.warning("Twilio not configured. SMS will not be sent.")
+        return False
+    return sms_outbox.enqueue(to_number, message_body, idempotency_key) is not None
+
+@background_task(0, workers=SMS_WORKERS)
+def dispatch_sms():
+    sms_outbox.dispatch_next()
+
+@background_task(60)
+def maintain_sms_outbox():
+    sms_outbox.requeue_stale(300)
+    purged = sms_outbox.purge(SMS_RETENTION_DAYS * 86400)
+    if purged:
+        log.info("Purged %s old SMS outbox rows", purged)
+
+## --- Admission Control ---
+# Scrape executions (each may hold Chrome drivers) run against a fixed budget
+# of slots sized from the CPU count and memory, split across gunicorn workers.
+# Requests that need a scrape wait in a short bounded queue for a slot; past
+# that, or while the machine is under memory/CPU pressure (needs psutil), they
+# are turned away at once with 429/503 and a Retry-After. Background work
+# (search tasks, the crawler, the SMS matcher) waits for a slot without a limit
+# instead. Queries the job index or fresh cache entries can answer skip the
+# budget entirely.
+ADMISSION_MAX_SCRAPES = int(os.environ.get("ADMISSION_MAX_SCRAPES", "0"))
+ADMISSION_SCRAPES_PER_CPU = float(os.environ.get("ADMISSION_SCRAPES_PER_CPU", "2"))
+ADMISSION_SCRAPE_MEMORY_MB = float(os.environ.get("ADMISSION_SCRAPE_MEMORY_MB", "400"))
+ADMISSION_MAX_WAITING = int(os.environ.get("ADMISSION_MAX_WAITING", "8"))
+ADMISSION_MAX_WAIT = float(os.environ.get("ADMISSION_MAX_WAIT", "5"))
+ADMISSION_MAX_MEMORY_PERCENT = float(os.environ.get("ADMISSION_MAX_MEMORY_PERCENT", "90"))
+ADMISSION_MAX_CPU_PERCENT = float(os.environ.get("ADMISSION_MAX_CPU_PERCENT", "95"))
+
+class Overloaded(Exception):
+    """Raised when a request is turned away; carries the HTTP status and Retry-After"""
+
+    def __init__(self, status, retry_after, message):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+@app.errorhandler(Overloaded)
+def overloaded_response(e):
+    response = jsonify({"error": str(e)})
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response, e.status
+
+def scrape_capacity():
+    if ADMISSION_MAX_SCRAPES:
+        return ADMISSION_MAX_SCRAPES
+    capacity = (os.cpu_count() or 1) * ADMISSION_SCRAPES_PER_CPU
+    if psutil:
+        capacity = min(capacity, psutil.virtual_memory().total / 2**20 * 0.75 / ADMISSION_SCRAPE_MEMORY_MB)
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+    return max(int(capacity / workers), 1)
+
+class AdmissionController:
+    """Slots for concurrent scrape executions with a bounded queue of waiting requests"""
+
+    def __init__(self, capacity, max_waiting):
+        self.capacity = capacity
+        self.max_waiting = max_waiting
+        self.cond = threading.Condition()
+        self.in_use = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.avg_seconds = 10.0
+        self.memory_percent = 0.0
+        self.cpu_percent = 0.0
+
+    def retry_after(self, queued=0):
+        """Seconds until a slot is likely to be free for a request behind `queued` others"""
+        return max(math.ceil(self.avg_seconds * (queued + 1) / self.capacity), 1)
+
+    def _pressure(self):
+        if self.memory_percent > ADMISSION_MAX_MEMORY_PERCENT:
+            return "memory"
+        if self.cpu_percent > ADMISSION_MAX_CPU_PERCENT:
+            return "cpu"
+        return None
+
+    def check(self):
+        """Raise Overloaded if a request that needs a scrape would be turned away now"""
+        with self.cond:
+            self._check()
+
+    def _check(self):
+        pressure = self._pressure()
+        if pressure:
+            self.rejected += 1
+            raise Overloaded(503, self.retry_after(self.waiting), f"Server is under {pressure} pressure. Please try again shortly.")
+        if self.in_use >= self.capacity and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise Overloaded(429, self.retry_after(self.waiting), "Too many searches in progress. Please try again shortly.")
+
+    def acquire(self, wait=None):
+        """Take a slot and return a token for release(). With `wait` set this is a
+        request: it is checked for overload and waits at most `wait` seconds.
+        Without it the caller is background work and waits as long as needed."""
+        with self.cond:
+            if wait is not None:
+                self._check()
+                self.waiting += 1
+            deadline = time.monotonic() + wait if wait is not None else None
+            try:
+                while self.in_use >= self.capacity:
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        self.timed_out += 1
+                        raise Overloaded(503, self.retry_after(self.waiting), "Timed out waiting for search capacity. Please try again shortly.")
+                    self.cond.wait(remaining)
+            finally:
+                if wait is not None:
+                    self.waiting -= 1
+            self.in_use += 1
+            self.admitted += 1
+        return time.monotonic()
+
+    def release(self, token):
+        with self.cond:
+            self.in_use -= 1
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.monotonic() - token)
+            self.cond.notify()
+
+    @contextmanager
+    def slot(self, wait=None):
+        token = self.acquire(wait)
+        try:
+            yield
+        finally:
+            self.release(token)
+
+    def stats(self):
+        with self.cond:
+            return {
+                "capacity": self.capacity,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_scrape_seconds": round(self.avg_seconds, 2),
+                "memory_percent": self.memory_percent,
+                "cpu_percent": self.cpu_percent
+            }
+
+admission = AdmissionController(scrape_capacity(), ADMISSION_MAX_WAITING)
+
+@background_task(2)
+def sample_load():
+    # Sampled here rather than per request: cpu_percent() measures since its
+    # previous call, so back-to-back calls would read noise
+    if psutil:
+        admission.memory_percent = psutil.virtual_memory().percent
+        admission.cpu_percent = psutil.cpu_percent(interval=None)
+
+def cached_jobs(skills, location, preferred_role=None, use_index=True):
+    """Answer a query from the job index or fresh cache entries alone, or return
+    None if it needs a scrape"""
+    if use_index:
+        jobs = job_index.search(skills, location, preferred_role)
+        if jobs is not None:
+            return jobs
+    results = []
+    for source in PRIMARY_SOURCES:
+        jobs, state = result_cache.lookup(source["name"], skills, location, source["cache_ttl"])
+        if state != "fresh":
+            return None
+        results.extend(jobs)
+    return dedupe_jobs(results) if results else None
+
+## --- Paginated Results ---
+# A search keeps its whole ranked result set and clients page through it with
+# an opaque cursor instead of resubmitting. Reading past the end scrapes the
+# next page of every source, drops postings already in the set and appends the
+# rest, so earlier pages never shift under a cursor that was handed out.
+RESULTS_PAGE_SIZE = int(os.environ.get("RESULTS_PAGE_SIZE", "10"))
+RESULTS_MAX_LIMIT = int(os.environ.get("RESULTS_MAX_LIMIT", "50"))
+MAX_SOURCE_PAGES = int(os.environ.get("MAX_SOURCE_PAGES", "5"))
+
+def encode_cursor(offset):
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """Return the offset a cursor points at, raising ValueError if it is malformed"""
     try:
-        candidate_data = {
-            "name": data.get('name'),
-            "email": data.get('email'),
-            "phone_number": data.get('phone'),
-            "tech_stacks": data.get('techStacks'),
-            "location": data.get('location'),
-            "city": data.get('city'),
-            "project_details": data.get('projectDetails'),
-            "experience": data.get('experience'),
-            "preferred_role": data.get('preferredRole'),
-            "sms_notifications": data.get('smsNotifications', False)
-        }
-        
-        print(f"Attempting to store data: {candidate_data}")
-        
-        response = supabase.table("candidates").insert(candidate_data).execute()
-        
-        if hasattr(response, 'data') and response.data:
-            print(f"Data stored successfully in Supabase: {response.data}")
-            return True
+        offset = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))["offset"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+local_schema("""CREATE TABLE IF NOT EXISTS result_sets (
+    id TEXT PRIMARY KEY,
+    skills TEXT NOT NULL,
+    location TEXT NOT NULL,
+    preferred_role TEXT,
+    jobs TEXT NOT NULL,
+    source_pages INTEGER NOT NULL,
+    exhausted INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+)""")
+
+class ResultSets:
+    """Ranked search results kept in SQLite, extended one source page at a time"""
+
+    def create(self, skills, location, preferred_role, jobs):
+        """Store the first page of a search and return the result set id"""
+        set_id = uuid.uuid4().hex
+        local_db().execute("""INSERT INTO result_sets (id, skills, location, preferred_role, jobs, source_pages, exhausted, updated_at)
+                              VALUES (?, ?, ?, ?, ?, 1, ?, ?)""",
+                           (set_id, skills, location, preferred_role, json.dumps(jobs), int(not jobs), time.time()))
+        return set_id
+
+    def _get(self, set_id):
+        return local_db().execute("SELECT * FROM result_sets WHERE id = ?", (set_id,)).fetchone()
+
+    def _extend(self, row):
+        """Append the next source page and return False if nothing changed"""
+        page = row["source_pages"] + 1
+        if page > MAX_SOURCE_PAGES:
+            jobs, complete = [], True
         else:
-            print(f"Unexpected response format: {response}")
-            return False
-            
-    except Exception as db_error:
-        print(f"Database storage error: {db_error}")
-        print(f"Error type: {type(db_error)}")
-        return False
+            jobs, complete = search_sources(row["skills"], row["location"], page=page, wait=ADMISSION_MAX_WAIT)
+        progressed = True
+        db = local_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            current = self._get(row["id"])
+            # Another request (or worker) may have appended this page while we scraped
+            if current and current["source_pages"] < page:
+                existing = json.loads(current["jobs"])
+                deduplicator = JobDeduplicator()
+                for job in existing:
+                    deduplicator.add(job)
+                new_jobs = rank_jobs([job for job in jobs if deduplicator.add(job)],
+                                     row["skills"], row["location"], row["preferred_role"])
+                # A page where some source timed out or was skipped proves nothing about
+                # the end of the listings; keep the page to retry unless it still added jobs
+                if new_jobs or complete:
+                    db.execute("UPDATE result_sets SET jobs = ?, source_pages = ?, exhausted = ?, updated_at = ? WHERE id = ?",
+                               (json.dumps(existing + new_jobs), page, int(not new_jobs), time.time(), row["id"]))
+                else:
+                    progressed = False
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return progressed
+
+    def page(self, set_id, offset, limit, fetch_more=True):
+        """Return {jobs, jobs_found, next_cursor} for a slice of a result set, or None
+        if it does not exist. Source pages are only scraped when the slice needs them."""
+        row = self._get(set_id)
+        if not row:
+            return None
+        jobs = json.loads(row["jobs"])
+        while fetch_more and offset + limit > len(jobs) and not row["exhausted"]:
+            progressed = self._extend(row)
+            row = self._get(set_id)
+            jobs = json.loads(row["jobs"])
+            if not progressed:
+                break
+
+        end = offset + limit
+        has_more = end < len(jobs) or not row["exhausted"]
+        return {
+            "jobs": jobs[offset:end],
+            "jobs_found": len(jobs),
+            "next_cursor": encode_cursor(end) if has_more else None
+        }
+
+    def purge(self, older_than):
+        local_db().execute("DELETE FROM result_sets WHERE updated_at < ?", (time.time() - older_than,))
+
+result_sets = ResultSets()
+
+## --- Search Task Queue ---
+# Submissions enqueue a search task and return straight away. Tasks live in
+# SQLite so every gunicorn worker shares one queue and nothing is lost on a
+# restart; tasks left running by a dead worker are requeued.
+TASK_QUEUE_MAX_PENDING = int(os.environ.get("TASK_QUEUE_MAX_PENDING", "200"))
+TASK_WORKERS = int(os.environ.get("TASK_WORKERS", "4"))
+TASK_STALE_SECONDS = float(os.environ.get("TASK_STALE_SECONDS", "300"))
+TASK_RETENTION_SECONDS = float(os.environ.get("TASK_RETENTION_SECONDS", "86400"))
+
+local_schema("""CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+)""", "CREATE INDEX IF NOT EXISTS tasks_status_created ON tasks (status, created_at)")
+
+class TaskQueue:
+    """Bounded, persistent FIFO of background tasks"""
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self.wakeup = threading.Event()
+
+    def enqueue(self, kind, payload):
+        """Add a task and return its id, or None if the queue is full"""
+        task_id = uuid.uuid4().hex
+        db = local_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            pending = db.execute("SELECT COUNT(*) FROM tasks WHERE status = 'queued'").fetchone()[0]
+            if pending >= self.max_pending:
+                db.execute("ROLLBACK")
+                return None
+            db.execute("INSERT INTO tasks (id, kind, status, payload, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                       (task_id, kind, json.dumps(payload), time.time()))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        self.wakeup.set()
+        return task_id
+
+    def record(self, kind, payload, result):
+        """Store a task that already ran inline and return its id"""
+        task_id = uuid.uuid4().hex
+        now = time.time()
+        local_db().execute("""INSERT INTO tasks (id, kind, status, payload, result, created_at, started_at, finished_at)
+                              VALUES (?, ?, 'done', ?, ?, ?, ?, ?)""",
+                           (task_id, kind, json.dumps(payload), json.dumps(result), now, now, now))
+        return task_id
+
+    def report(self, task_id, result):
+        """Store a partial result for a running task. It also serves as a heartbeat,
+        so long tasks that keep reporting are not requeued as stalled."""
+        local_db().execute("UPDATE tasks SET result = ?, started_at = ? WHERE id = ? AND status = 'running'",
+                           (json.dumps(result), time.time(), task_id))
+
+    def claim(self):
+        """Mark the oldest queued task as running and return it"""
+        db = local_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute("SELECT * FROM tasks WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+            if row:
+                db.execute("UPDATE tasks SET status = 'running', started_at = ? WHERE id = ?", (time.time(), row["id"]))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return row
+
+    def finish(self, task_id, result=None, error=None):
+        local_db().execute("UPDATE tasks SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                           ("failed" if error else "done", json.dumps(result) if result is not None else None,
+                            error, time.time(), task_id))
+
+    def get(self, task_id):
+        row = local_db().execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if not row:
+            return None
+        return {
+            "task_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"]
+        }
+
+    def requeue_stale(self, older_than):
+        cursor = local_db().execute("UPDATE tasks SET status = 'queued', started_at = NULL WHERE status = 'running' AND started_at < ?",
+                                    (time.time() - older_than,))
+        if cursor.rowcount:
+            log.warning("Requeued %s stalled tasks", cursor.rowcount)
+
+    def purge(self, older_than):
+        local_db().execute("DELETE FROM tasks WHERE status IN ('done', 'failed') AND finished_at < ?",
+                           (time.time() - older_than,))
+
+    def depth(self):
+        return local_db().execute("SELECT COUNT(*) FROM tasks WHERE status = 'queued'").fetchone()[0]
+
+task_queue = TaskQueue(TASK_QUEUE_MAX_PENDING)
+TASK_HANDLERS = {}
+_current_task = threading.local()
+
+def report_progress(result):
+    """Publish a partial result for the task running in this thread"""
+    task_id = getattr(_current_task, "task_id", None)
+    if task_id:
+        task_queue.report(task_id, result)
+
+def task_handler(kind):
+    """Register the function that runs tasks of the given kind"""
+    def register(func):
+        TASK_HANDLERS[kind] = func
+        return func
+    return register
+
+@background_task(0, workers=TASK_WORKERS)
+def process_next_task():
+    task = task_queue.claim()
+    if not task:
+        task_queue.wakeup.wait(1)
+        task_queue.wakeup.clear()
+        return
+    _current_task.task_id = task["id"]
+    try:
+        result = TASK_HANDLERS[task["kind"]](json.loads(task["payload"]))
+        task_queue.finish(task["id"], result=result)
+    except Exception as e:
+        log.error("Error running task %s: %s", task['id'], e)
+        task_queue.finish(task["id"], error=str(e))
+    finally:
+        _current_task.task_id = None
+
+@background_task(TASK_STALE_SECONDS)
+def maintain_task_queue():
+    task_queue.requeue_stale(TASK_STALE_SECONDS)
+    task_queue.purge(TASK_RETENTION_SECONDS)
+    result_sets.purge(TASK_RETENTION_SECONDS)
+
+@task_handler("search")
+def search_for_candidate(data, jobs=None):
+    """Scrape jobs for a submitted profile and queue the SMS summary if requested.
+    `jobs` skips the search when the caller already has the results."""
+    name = data.get('name')
+    phone = data.get('phone')
+    tech_stacks = data.get('techStacks')
+    location = data.get('location')
+    sms_notifications = data.get('smsNotifications', False)
+
+    job_index.record_query(tech_stacks, location)
+    if jobs is None:
+        jobs = find_jobs(tech_stacks, location, data.get('preferredRole'))
+    all_jobs = rank_jobs(jobs, tech_stacks, location, data.get('preferredRole'))
+
+    if not all_jobs:
+        log.warning("No jobs found from any source. User will receive empty results.")
+    else:
+        log.info("Total jobs found: %s", len(all_jobs))
+
+    # The task result carries the first page; the rest is read through /api/tasks/<id>/results
+    result_set = result_sets.create(tech_stacks, location, data.get('preferredRole'), all_jobs)
+    result = result_sets.page(result_set, 0, RESULTS_PAGE_SIZE, fetch_more=False)
+    result["result_set"] = result_set
+
+    if sms_notifications and all_jobs and phone:
+        result["sms_queued"] = queue_sms(phone, format_job_sms(name, all_jobs))
+        if result["sms_queued"]:
+            # Recurring alerts only send postings the candidate has not seen yet
+            mark_notified(phone, all_jobs[:SMS_LISTED_JOBS])
+
+    return result
+
+## --- Local Job Index ---
+# Normalized postings are kept in SQLite with an inverted index on skill,
+# location and role (title) terms. A background crawler keeps the popular
+# (skill, location) queries fresh, so most submissions are answered from the
+# index and only uncovered queries fall back to a live scrape. Postings and
+# coverage expire after JOB_INDEX_MAX_AGE, matching LinkedIn's 24h filter.
+JOB_INDEX_MAX_AGE = float(os.environ.get("JOB_INDEX_MAX_AGE", "86400"))
+JOB_CRAWL_INTERVAL = float(os.environ.get("JOB_CRAWL_INTERVAL", "1800"))
+JOB_CRAWL_TOP_QUERIES = int(os.environ.get("JOB_CRAWL_TOP_QUERIES", "20"))
+# Always-crawled queries, e.g. "python,react@Mumbai;java@Bangalore"
+JOB_CRAWL_QUERIES = os.environ.get("JOB_CRAWL_QUERIES", "")
+
+local_schema("""CREATE TABLE IF NOT EXISTS indexed_jobs (
+    link_key TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    link TEXT NOT NULL,
+    source TEXT NOT NULL,
+    location TEXT NOT NULL DEFAULT '',
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+)""", add_column("indexed_jobs", "location", "TEXT NOT NULL DEFAULT ''"))
+local_schema("""CREATE TABLE IF NOT EXISTS job_terms (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    link_key TEXT NOT NULL,
+    PRIMARY KEY (field, term, link_key)
+)""", "CREATE INDEX IF NOT EXISTS job_terms_link ON job_terms (link_key)")
+local_schema("""CREATE TABLE IF NOT EXISTS index_coverage (
+    skill TEXT NOT NULL,
+    location TEXT NOT NULL,
+    crawled_at REAL NOT NULL,
+    PRIMARY KEY (skill, location)
+)""")
+local_schema("""CREATE TABLE IF NOT EXISTS query_stats (
+    skills TEXT NOT NULL,
+    location TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    last_requested REAL NOT NULL,
+    PRIMARY KEY (skills, location)
+)""")
+
+class JobIndex:
+    def __init__(self, max_age):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, skills, location, jobs):
+        """Index the jobs a (skills, location) search returned and mark it covered"""
+        skill_terms = canonical_skills(skills).split(",")
+        location_key = normalize_location(location)
+        now = time.time()
+        db = local_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for job in jobs:
+                link_key = canonical_link(job['link'])
+                db.execute("""INSERT INTO indexed_jobs (link_key, title, company, link, source, location, first_seen, last_seen)
+                              VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                              ON CONFLICT (link_key) DO UPDATE SET last_seen = excluded.last_seen""",
+                           (link_key, job['title'], job['company'], job['link'], job['source'], job.get('location', ""), now, now))
+                terms = [("skill", skill) for skill in skill_terms]
+                terms.append(("location", location_key))
+                terms.extend(("role", token) for token in set(tokenize(job['title'])))
+                db.executemany("INSERT OR IGNORE INTO job_terms (field, term, link_key) VALUES (?, ?, ?)",
+                               [(field, term, link_key) for field, term in terms])
+            db.executemany("INSERT OR REPLACE INTO index_coverage (skill, location, crawled_at) VALUES (?, ?, ?)",
+                           [(skill, location_key, now) for skill in skill_terms])
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def search(self, skills, location, preferred_role=None, limit=50):
+        """Return indexed jobs for the query, or None if the index does not cover it"""
+        skill_terms = canonical_skills(skills).split(",")
+        location_key = normalize_location(location)
+        cutoff = time.time() - self.max_age
+        db = local_db()
+
+        covered = db.execute(
+            f"SELECT COUNT(*) FROM index_coverage WHERE location = ? AND crawled_at >= ? AND skill IN ({','.join('?' * len(skill_terms))})",
+            [location_key, cutoff] + skill_terms
+        ).fetchone()[0]
+        if covered < len(skill_terms):
+            with self.lock:
+                self.misses += 1
+            return None
+
+        role_terms = list(set(tokenize(preferred_role))) or [""]
+        rows = db.execute(f"""
+            SELECT j.title, j.company, j.link, j.source, j.location,
+                   COUNT(DISTINCT s.term) AS skill_matches,
+                   (SELECT COUNT(*) FROM job_terms r WHERE r.link_key = j.link_key AND r.field = 'role'
+                    AND r.term IN ({','.join('?' * len(role_terms))})) AS role_matches
+            FROM indexed_jobs j
+            JOIN job_terms l ON l.link_key = j.link_key AND l.field = 'location' AND l.term = ?
+            JOIN job_terms s ON s.link_key = j.link_key AND s.field = 'skill'
+                 AND s.term IN ({','.join('?' * len(skill_terms))})
+            WHERE j.last_seen >= ?
+            GROUP BY j.link_key
+            ORDER BY skill_matches DESC, role_matches DESC, j.last_seen DESC
+            LIMIT ?""", role_terms + [location_key] + skill_terms + [cutoff, limit]).fetchall()
+
+        with self.lock:
+            self.hits += 1
+        return [{'title': row["title"], 'company': row["company"], 'location': row["location"], 'link': row["link"],
+                 'source': row["source"]} for row in rows]
+
+    def record_query(self, skills, location):
+        local_db().execute("""INSERT INTO query_stats (skills, location, requests, last_requested) VALUES (?, ?, 1, ?)
+                              ON CONFLICT (skills, location) DO UPDATE SET requests = requests + 1,
+                              last_requested = excluded.last_requested""",
+                           (canonical_skills(skills), normalize_location(location), time.time()))
+
+    def popular_queries(self, limit, window=7 * 86400):
+        rows = local_db().execute("""SELECT skills, location FROM query_stats WHERE last_requested >= ?
+                                     ORDER BY requests DESC LIMIT ?""", (time.time() - window, limit)).fetchall()
+        return [(row["skills"], row["location"]) for row in rows]
+
+    def expire(self):
+        cutoff = time.time() - self.max_age
+        db = local_db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM job_terms WHERE link_key IN (SELECT link_key FROM indexed_jobs WHERE last_seen < ?)", (cutoff,))
+            db.execute("DELETE FROM indexed_jobs WHERE last_seen < ?", (cutoff,))
+            db.execute("DELETE FROM index_coverage WHERE crawled_at < ?", (cutoff,))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def postings(self):
+        return local_db().execute("SELECT COUNT(*) FROM indexed_jobs").fetchone()[0]
+
+    def stats(self):
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+job_index = JobIndex(JOB_INDEX_MAX_AGE)
+
+def crawl_queries():
+    """Configured queries first, then the most requested ones"""
+    queries = []
+    for entry in filter(None, JOB_CRAWL_QUERIES.split(";")):
+        skills, _, location = entry.partition("@")
+        queries.append((canonical_skills(skills), normalize_location(location)))
+    for query in job_index.popular_queries(JOB_CRAWL_TOP_QUERIES):
+        if query not in queries:
+            queries.append(query)
+    return queries
+
+@background_task(JOB_CRAWL_INTERVAL)
+def crawl_job_index():
+    if not claim_lease("job-crawler", JOB_CRAWL_INTERVAL):
+        return
+    job_index.expire()
+    for skills, location in crawl_queries():
+        if not skills or not location:
+            continue
+        jobs = run_scrapers(skills, location)
+        if jobs:
+            job_index.add(skills, location, jobs)
+        log.info("Crawled %s jobs for %s in %s", len(jobs), skills, location)
+
+## --- Recurring SMS Alerts ---
+# Subscribed candidates are grouped by canonical (skills, location), so each
+# distinct query is searched once per cycle however many candidates share it.
+# A per-candidate seen-set of job links means only new postings are sent.
+SMS_MATCH_INTERVAL = float(os.environ.get("SMS_MATCH_INTERVAL", "21600"))
+SMS_SEEN_RETENTION = float(os.environ.get("SMS_SEEN_RETENTION", str(30 * 86400)))
+SUPABASE_PAGE_SIZE = 1000
+
+local_schema("""CREATE TABLE IF NOT EXISTS notified_jobs (
+    candidate_key TEXT NOT NULL,
+    link_key TEXT NOT NULL,
+    notified_at REAL NOT NULL,
+    PRIMARY KEY (candidate_key, link_key)
+)""")
+matcher_stats = {"last_run": None, "candidates": 0, "queries": 0, "notified": 0}
+
+def mark_notified(phone, jobs):
+    now = time.time()
+    local_db().executemany("INSERT OR IGNORE INTO notified_jobs (candidate_key, link_key, notified_at) VALUES (?, ?, ?)",
+                           [(normalize_phone(phone), canonical_link(job['link']), now) for job in jobs])
+
+def unseen_jobs(phone, jobs):
+    seen = {row[0] for row in local_db().execute("SELECT link_key FROM notified_jobs WHERE candidate_key = ?",
+                                                 (normalize_phone(phone),))}
+    return [job for job in jobs if canonical_link(job['link']) not in seen]
+
+def fetch_sms_subscribers():
+    """Page through every candidate who opted into SMS"""
+    candidates = []
+    start = 0
+    while True:
+        with DB_SECONDS.time(operation="subscribers_select"):
+            response = (get_supabase().table("candidates")
+                        .select("name, phone_number, tech_stacks, location, preferred_role")
+                        .eq("sms_notifications", True)
+                        .range(start, start + SUPABASE_PAGE_SIZE - 1)
+                        .execute())
+        candidates.extend(response.data)
+        if len(response.data) < SUPABASE_PAGE_SIZE:
+            return candidates
+        start += SUPABASE_PAGE_SIZE
+
+def find_jobs(skills, location, preferred_role=None):
+    """Answer from the job index, scraping live only when it does not cover the query"""
+    jobs = job_index.search(skills, location, preferred_role)
+    if jobs is None:
+        jobs = run_scrapers(skills, location)
+        if jobs:
+            job_index.add(skills, location, jobs)
+    return jobs
+
+@background_task(SMS_MATCH_INTERVAL)
+def notify_new_matches():
+    if not get_supabase() or not claim_lease("sms-matcher", SMS_MATCH_INTERVAL):
+        return
+
+    groups = {}
+    candidates = [c for c in fetch_sms_subscribers() if c.get('phone_number') and c.get('tech_stacks') and c.get('location')]
+    for candidate in candidates:
+        key = (canonical_skills(candidate['tech_stacks']), normalize_location(candidate['location']))
+        groups.setdefault(key, []).append(candidate)
+
+    notified = 0
+    for (skills, location), members in groups.items():
+        jobs = find_jobs(skills, location)
+        if not jobs:
+            continue
+        for candidate in members:
+            new_jobs = unseen_jobs(candidate['phone_number'], jobs)
+            if not new_jobs:
+                continue
+            new_jobs = rank_jobs(new_jobs, skills, location, candidate.get('preferred_role'))
+            listed = new_jobs[:SMS_LISTED_JOBS]
+            alert_key = hashlib.sha256("\n".join([normalize_phone(candidate['phone_number'])] +
+                                                  sorted(canonical_link(job['link']) for job in listed)).encode()).hexdigest()
+            # An alert already in the outbox counts as sent, so its jobs stop being "new"
+            if (queue_sms(candidate['phone_number'], format_job_sms(candidate.get('name'), new_jobs, new=True), alert_key)
+                    or sms_outbox.status(alert_key)):
+                mark_notified(candidate['phone_number'], listed)
+                notified += 1
+
+    local_db().execute("DELETE FROM notified_jobs WHERE notified_at < ?", (time.time() - SMS_SEEN_RETENTION,))
+    matcher_stats.update(last_run=time.time(), candidates=len(candidates), queries=len(groups), notified=notified)
+    log.info("SMS matcher: %s candidates, %s queries, %s notified", len(candidates), len(groups), notified)
+
+## --- Bulk Candidate Ingestion ---
+# Placement cells upload whole spreadsheets. Rows are validated like single
+# submissions and inserted in bulk. The batch then runs as one task that
+# searches once per distinct (skills, location) and hands the results to every
+# candidate in that group.
+BULK_MAX_ROWS = int(os.environ.get("BULK_MAX_ROWS", "1000"))
+
+# Spreadsheet headers, lowercased with spaces, dashes and underscores removed
+BULK_COLUMNS = {
+    "name": "name",
+    "email": "email",
+    "phone": "phone",
+    "phonenumber": "phone",
+    "techstacks": "techStacks",
+    "skills": "techStacks",
+    "location": "location",
+    "city": "city",
+    "projectdetails": "projectDetails",
+    "experience": "experience",
+    "preferredrole": "preferredRole",
+    "role": "preferredRole",
+    "smsnotifications": "smsNotifications",
+}
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+def parse_bulk_candidates(req):
+    """Read the uploaded candidates as a list of profile dicts, or raise ValueError.
+    Accepts a JSON array (or {"candidates": [...]}), a CSV body, or a CSV file upload."""
+    upload = req.files.get("file")
+    if upload or "csv" in (req.content_type or ""):
+        raw = upload.read() if upload else req.get_data()
+        return [normalize_bulk_row(record) for record in csv.DictReader(io.StringIO(raw.decode("utf-8-sig")))]
+
+    data = req.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get("candidates")
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of candidates or a CSV file")
+    return [normalize_bulk_row(record) if isinstance(record, dict) else record for record in data]
+
+def normalize_bulk_row(record):
+    """Map a CSV record or JSON object onto profile fields the same way.
+    Strings are stripped, other values are left for validate_profile to reject."""
+    row = {}
+    for key, value in record.items():
+        field = BULK_COLUMNS.get(re.sub(r"[\s_-]", "", str(key or "").lower()))
+        if field:
+            row[field] = value.strip() if isinstance(value, str) else value
+    sms = row.get("smsNotifications")
+    row["smsNotifications"] = sms if isinstance(sms, bool) else str(sms or "").lower() in TRUE_VALUES
+    return row
+
+@task_handler("batch_search")
+def search_for_batch(payload):
+    """Search once per (skills, location) group and give each candidate their results"""
+    candidates = payload["candidates"]
+    groups = {}
+    for position, data in enumerate(candidates):
+        key = (canonical_skills(data.get('techStacks')), normalize_location(data.get('location')))
+        groups.setdefault(key, []).append(position)
+
+    results = [None] * len(candidates)
+    progress = {"candidates": len(candidates), "groups": len(groups), "groups_done": 0, "processed": 0, "failed": 0}
+    for (skills, location), positions in groups.items():
+        try:
+            jobs = find_jobs(skills, location)
+        except Exception as e:
+            log.error("Batch search failed for %s in %s: %s", skills, location, e)
+            jobs = None
+
+        for position in positions:
+            data = candidates[position]
+            if jobs is None:
+                results[position] = {"email": data.get('email'), "error": "Search failed"}
+                progress["failed"] += 1
+                continue
+            result = search_for_candidate(data, jobs)
+            results[position] = {
+                "email": data.get('email'),
+                "jobs_found": result["jobs_found"],
+                "results_url": f"/api/results/{result['result_set']}",
+                "sms_queued": result.get("sms_queued", False)
+            }
+            progress["processed"] += 1
+        progress["groups_done"] += 1
+        report_progress(progress)
+
+    return {**progress, "results": results}
+
+## --- Health Probe ---
+# Health endpoints answer from this snapshot. It is refreshed in the background,
+# so a load balancer probe never launches Chrome, waits on a remote API or
+# counts rows in the local SQLite store.
+HEALTH_PROBE_INTERVAL = float(os.environ.get("HEALTH_PROBE_INTERVAL", "30"))
+CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+
+health_snapshot = {
+    "supabase": {"status": "unknown"},
+    "twilio": {"status": "unknown"},
+    "selenium": "unknown",
+    "store": {},
+    "checked_at": None
+}
+
+def _timed_probe(check):
+    started = time.monotonic()
+    try:
+        check()
+        status = "reachable"
+    except Exception as e:
+        log.error("Health probe failed: %s", e)
+        status = "unreachable"
+    return {"status": status, "latency_ms": round((time.monotonic() - started) * 1000, 1)}
+
+def probe_supabase():
+    client = get_supabase()
+    if not client:
+        return {"status": "not configured"}
+    return _timed_probe(lambda: client.table("candidates").select("id").limit(1).execute())
+
+def probe_twilio():
+    client = get_twilio_client()
+    if not client:
+        return {"status": "not configured"}
+    return _timed_probe(lambda: client.api.accounts(twilio_sid).fetch())
+
+def probe_selenium():
+    """Report Selenium as available if the pool has launched Chrome or a Chrome binary is installed"""
+    if driver_pool.stats()["created"] or any(shutil.which(name) for name in CHROME_BINARIES):
+        return "available"
+    return "not available"
+
+def probe_local_store():
+    """Row counts of the local queues and index"""
+    return {
+        "tasks_queued": task_queue.depth(),
+        "spill_depth": candidate_writer.spill_depth(),
+        "sms_outbox": sms_outbox.stats(),
+        "postings": job_index.postings()
+    }
+
+@background_task(HEALTH_PROBE_INTERVAL)
+def refresh_health_probe():
+    global health_snapshot
+    health_snapshot = {
+        "supabase": probe_supabase(),
+        "twilio": probe_twilio(),
+        "selenium": probe_selenium(),
+        "store": probe_local_store(),
+        "checked_at": time.time()
+    }
+
+def health_probe_age():
+    checked_at = health_snapshot["checked_at"]
+    return round(time.time() - checked_at, 1) if checked_at else None
+
+## --- Startup ---
+def warm_imports():
+    """Import the heavy optional libraries up front. Called by the gunicorn master
+    under preload so forked workers share the loaded modules instead of paying
+    for them on their first request."""
+    for module in ("bs4", "selenium.webdriver", "supabase", "twilio.rest"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    mark_startup("warm_imports")
+
+mark_startup("module_body")
+log.info("Startup phases (ms): %s", STARTUP_TIMINGS)
 
 ## --- API Routes ---
 @app.route('/api/test', methods=['GET'])
@@ -474,98 +3015,247 @@ def test():
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    snapshot = health_snapshot
+    store = snapshot["store"]
     return jsonify({
         "status": "healthy",
-        "supabase": "connected" if supabase else "not configured",
-        "twilio": "connected" if twilio_client else "not configured",
-        "selenium": "available" if create_selenium_driver() else "not available"
+        "supabase": snapshot["supabase"],
+        "twilio": snapshot["twilio"],
+        "selenium": snapshot["selenium"],
+        "driver_pool": driver_pool.stats(),
+        "result_cache": result_cache.stats(),
+        "http": http_stats(),
+        "task_queue": {"queued": store.get("tasks_queued"), "workers": TASK_WORKERS},
+        "single_flight": search_flights.stats(),
+        "candidate_writes": {**candidate_writer.stats(), "spill_depth": store.get("spill_depth")},
+        "sms_outbox": store.get("sms_outbox", {}),
+        "job_index": {**job_index.stats(), "postings": store.get("postings")},
+        "sms_matcher": matcher_stats,
+        "sources": breaker_stats(),
+        "admission": admission.stats(),
+        "startup_ms": STARTUP_TIMINGS,
+        "last_check_age_seconds": health_probe_age()
     }), 200
 
+def subsystem_metrics():
+    """The numeric /api/health subsystem stats as Prometheus gauges"""
+    store = health_snapshot["store"]
+    subsystems = {
+        "driver_pool": driver_pool.stats(),
+        "result_cache": result_cache.stats(),
+        "scrape_http": http_stats(),
+        "task_queue": {"queued": store.get("tasks_queued")},
+        "single_flight": search_flights.stats(),
+        "candidate_writes": {**candidate_writer.stats(), "spill_depth": store.get("spill_depth")},
+        "sms_outbox": store.get("sms_outbox", {}),
+        "job_index": {**job_index.stats(), "postings": store.get("postings")},
+        "admission": admission.stats()
+    }
+    lines = []
+    for subsystem, stats in subsystems.items():
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                name = f"ducky_{subsystem}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    return Response(render_metrics() + subsystem_metrics(), mimetype="text/plain; version=0.0.4")
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    age = health_probe_age()
+    ready = age is not None and age < HEALTH_PROBE_INTERVAL * 3
+    return jsonify({
+        "status": "ready" if ready else "not ready",
+        "last_check_age_seconds": age
+    }), 200 if ready else 503
+
 @app.route('/api/submit-profile', methods=['POST'])
 def submit_profile():
     try:
         data = request.json
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
-            
-        name = data.get('name')
-        email = data.get('email')
-        phone = data.get('phone')
+        error = validate_profile(data)
+        if error:
+            return jsonify({"error": error}), 400
+
         tech_stacks = data.get('techStacks')
         location = data.get('location')
-        sms_notifications = data.get('smsNotifications', False)
-
-        if not all([name, email, tech_stacks, location]):
-            return jsonify({"error": "Missing required fields"}), 400
 
         db_stored = store_candidate_data(data)
-        
-        all_jobs = []
-        all_jobs.extend(scrape_linkedin_with_selenium(tech_stacks, location))
-        all_jobs.extend(scrape_indeed_with_selenium(tech_stacks, location))
-        all_jobs.extend(scrape_glassdoor(tech_stacks, location))
-        all_jobs.extend(scrape_internshala(tech_stacks, location))
-        
-        if not all_jobs:
-            print("No jobs found from primary sources. Falling back to Google search...")
-            all_jobs.extend(scrape_google(tech_stacks, location))
-        
-        if not all_jobs:
-            print("No jobs found from any source. User will receive empty results.")
+
+        jobs = cached_jobs(tech_stacks, location, data.get('preferredRole'))
+        if jobs is not None:
+            # Nothing to scrape, so answer now instead of queueing behind scrapes
+            task_id = task_queue.record("search", data, search_for_candidate(data, jobs))
         else:
-            print(f"Total jobs found: {len(all_jobs)}")
-        
-        response_data = {
+            admission.check()
+            task_id = task_queue.enqueue("search", data)
+            if not task_id:
+                raise Overloaded(429, admission.retry_after(task_queue.depth()),
+                                 "Too many searches in progress. Please try again shortly.")
+
+        return jsonify({
             "message": "Profile submitted successfully!",
-            "jobs_found": len(all_jobs),
-            "jobs": all_jobs[:10],
+            "task_id": task_id,
+            "status_url": f"/api/tasks/{task_id}",
             "database_stored": db_stored
-        }
-        
-        if sms_notifications and all_jobs and phone:
-            job_summary = f"Hello {name}! We found {len(all_jobs)} internship opportunities for you.\n\n"
-            for i, job in enumerate(all_jobs[:3], 1):
-                job_summary += f"{i}. {job['title']} at {job['company']}\n"
-            
-            if all_jobs:
-                job_summary += f"\nCheck your email for more details!"
-            
-            sms_sent = send_sms(phone, job_summary)
-            response_data["sms_sent"] = sms_sent
-        
-        return jsonify(response_data), 200
+        }), 202
 
+    except Overloaded:
+        raise
     except Exception as e:
-        print(f"Error in submit_profile: {e}")
+        log.error("Error in submit_profile: %s", e)
         return jsonify({"error": f"Failed to submit profile: {str(e)}"}), 500
 
+@app.route('/api/tasks/<task_id>', methods=['GET'])
+def task_status(task_id):
+    task = task_queue.get(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    return jsonify(task), 200
+
+@app.route('/api/tasks/<task_id>/results', methods=['GET'])
+def task_results(task_id):
+    task = task_queue.get(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    if task["status"] == "failed":
+        return jsonify({"status": "failed", "error": task["error"]}), 500
+    if task["status"] != "done":
+        return jsonify({"status": task["status"]}), 202
+
+    result = task["result"]
+    if "result_set" not in result:
+        return jsonify(result), 200
+    return result_set_page(result["result_set"])
+
+@app.route('/api/results/<set_id>', methods=['GET'])
+def result_set_page(set_id):
+    try:
+        limit = min(max(int(request.args.get("limit", RESULTS_PAGE_SIZE)), 1), RESULTS_MAX_LIMIT)
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+    try:
+        offset = decode_cursor(request.args["cursor"]) if request.args.get("cursor") else 0
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    page = result_sets.page(set_id, offset, limit)
+    if page is None:
+        return jsonify({"error": "Results not found or expired"}), 404
+    return jsonify(page), 200
+
+@app.route('/api/candidates/bulk', methods=['POST'])
+def submit_candidates_bulk():
+    """Accept a batch of candidates and search for them in one background task"""
+    try:
+        rows = parse_bulk_candidates(request)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": f"Could not read candidates: {e}"}), 400
+    if not rows:
+        return jsonify({"error": "No candidates provided"}), 400
+    if len(rows) > BULK_MAX_ROWS:
+        return jsonify({"error": f"At most {BULK_MAX_ROWS} candidates per batch"}), 413
+
+    accepted, rejected, emails = [], [], set()
+    for number, data in enumerate(rows, start=1):
+        error = validate_profile(data) if isinstance(data, dict) else "Expected an object"
+        if not error and data['email'].lower() in emails:
+            error = "Duplicate email in batch"
+        if error:
+            rejected.append({"row": number, "error": error})
+            continue
+        emails.add(data['email'].lower())
+        accepted.append(data)
+
+    if not accepted:
+        return jsonify({"error": "No valid candidates", "rejected": rejected}), 400
+
+    task_id = task_queue.enqueue("batch_search", {"candidates": accepted})
+    if not task_id:
+        raise Overloaded(429, admission.retry_after(task_queue.depth()),
+                         "Too many searches in progress. Please try again shortly.")
+    db_stored = store_candidates(accepted)
+
+    return jsonify({
+        "message": f"Accepted {len(accepted)} candidates",
+        "task_id": task_id,
+        "status_url": f"/api/tasks/{task_id}",
+        "accepted": len(accepted),
+        "rejected": rejected,
+        "database_stored": db_stored
+    }), 202
+
+@app.route('/api/search/stream', methods=['POST'])
+def search_stream():
+    """Stream each source's jobs as soon as its scraper finishes.
+
+    Sends NDJSON by default, or Server-Sent Events when the client accepts
+    text/event-stream. The last event is a summary of the whole search.
+    """
+    data = request.json or {}
+    skills = data.get('techStacks') or data.get('skills')
+    location = data.get('location')
+    if not skills or not location:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    use_sse = "text/event-stream" in request.headers.get("Accept", "")
+    # The stream scrapes unless every source is cached, in which case it needs no slot
+    token = admission.acquire(wait=ADMISSION_MAX_WAIT) if cached_jobs(skills, location, use_index=False) is None else None
+
+    def encode(event):
+        payload = json.dumps(event)
+        return f"event: {event['type']}\ndata: {payload}\n\n" if use_sse else payload + "\n"
+
+    def generate():
+        started = time.monotonic()
+        sources = {}
+        deduplicator = JobDeduplicator()
+        for source, jobs, elapsed in iter_source_results(skills, location):
+            jobs = [job for job in jobs if deduplicator.add(job)]
+            sources[source] = len(jobs)
+            yield encode({
+                "type": "jobs",
+                "source": source,
+                "elapsed": round(elapsed, 3),
+                "count": len(jobs),
+                "jobs": jobs
+            })
+        yield encode({
+            "type": "summary",
+            "jobs_found": sum(sources.values()),
+            "sources": sources,
+            "elapsed": round(time.monotonic() - started, 3)
+        })
+
+    response = Response(generate(), mimetype="text/event-stream" if use_sse else "application/x-ndjson")
+    if token is not None:
+        response.call_on_close(lambda: admission.release(token))
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
 @app.route('/api/test-scrape', methods=['POST'])
 def test_scrape():
     data = request.json
     skills = data.get('skills', 'python,javascript')
     location = data.get('location', 'Mumbai, India')
     
-    all_jobs = []
-    
-    linkedin_jobs = scrape_linkedin_with_selenium(skills, location)
-    all_jobs.extend(linkedin_jobs)
-    
-    indeed_jobs = scrape_indeed_with_selenium(skills, location)
-    all_jobs.extend(indeed_jobs)
-    
-    all_jobs.extend(scrape_glassdoor(skills, location))
-    all_jobs.extend(scrape_internshala(skills, location))
-    
-    if not all_jobs:
-        all_jobs.extend(scrape_google(skills, location))
+    jobs = cached_jobs(skills, location)
+    if jobs is None:
+        jobs = run_scrapers(skills, location, wait=ADMISSION_MAX_WAIT)
+    all_jobs = rank_jobs(jobs, skills, location)
     
     return jsonify({
         "jobs": all_jobs,
         "count": len(all_jobs),
-        "selenium_available": create_selenium_driver() is not None
+        "selenium_available": health_snapshot["selenium"] == "available"
     })
 
 if __name__ == '__main__':
-    print("Starting Flask application...")
-    print("Make sure to install Selenium and Chrome driver!")
+    log.info("Starting Flask application...")
+    log.info("Make sure to install Selenium and Chrome driver!")
     app.run(host='127.0.0.1', port=3001, debug=True)
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Compare parse time of the listing parsers under each HTML parsing mode.
+
+    python bench/bench_parse.py [--repeat 50]
+
+The baseline mode is the original full html.parser parse. Every mode must
+produce exactly the same job dicts, otherwise the run fails.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DRIVER_POOL_WARM", "0")
+os.environ.setdefault("LOCAL_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="ducky-bench-"), "bench.db"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app  # noqa: E402
+from fixtures import PAGES  # noqa: E402
+
+PARSERS = {
+    "indeed": app.parse_indeed,
+    "glassdoor": app.parse_glassdoor,
+    "internshala": app.parse_internshala,
+    "google": app.parse_google,
+}
+
+MODES = [("html.parser", False), ("html.parser", True)]
+if app.LXML_AVAILABLE:
+    MODES += [("lxml", False), ("lxml", True)]
+
+def run(repeat):
+    report = {}
+    for source, parse in PARSERS.items():
+        content = PAGES[source]().encode()
+        expected = None
+        report[source] = {"page_bytes": len(content)}
+        for parser, partial in MODES:
+            app.HTML_PARSER, app.HTML_PARTIAL_PARSING = parser, partial
+            jobs = parse(content)
+            if expected is None:
+                expected = jobs
+            elif jobs != expected:
+                raise SystemExit(f"{source}: {parser} partial={partial} output differs from baseline")
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                parse(content)
+            mode = f"{parser}{'+partial' if partial else ''}"
+            report[source][mode] = round((time.perf_counter() - started) / repeat * 1000, 3)
+        report[source]["cards"] = len(expected)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat), indent=2))
@@ -0,0 +1,96 @@
+"""Deterministic listing pages for the benchmarks.
+
+Each page reproduces the markup the scrapers in app.py select on (card
+containers, title/company/link elements) inside a page padded with the
+scripts, styles, navigation and footer weight of the real sites, so parse
+cost is representative without hitting the live sites.
+"""
+
+COMPANIES = ["Acme Labs", "Globex", "Initech", "Hooli", "Umbrella Tech", "Stark Digital", "Wayne Systems", "Pied Piper"]
+ROLES = ["Software Engineering Intern", "Python Developer Internship", "Frontend Trainee",
+         "Data Science Intern", "Backend Developer Intern", "Full Stack Internship"]
+
+def _padding(blocks):
+    script = "<script>window.__STATE__ = {" + ",".join(f'"k{i}": {i}' for i in range(400)) + "};</script>"
+    style = "<style>" + "".join(f".c{i}{{margin:{i}px;padding:{i}px}}" for i in range(300)) + "</style>"
+    nav = "<nav><ul>" + "".join(f'<li><a href="/nav/{i}">Link {i}</a></li>' for i in range(80)) + "</ul></nav>"
+    filler = "".join(
+        f'<section class="promo"><div><p>Promoted content {i}</p><span class="muted">Ad</span>'
+        f'<img src="/img/{i}.png" alt=""></div></section>'
+        for i in range(blocks)
+    )
+    return script + style, nav + filler
+
+def _page(cards, blocks=150):
+    head, body = _padding(blocks)
+    return f"<!DOCTYPE html><html><head><title>Jobs</title>{head}</head><body>{body}<main>{cards}</main>{body}</body></html>"
+
+def _job(i):
+    return ROLES[i % len(ROLES)], COMPANIES[i % len(COMPANIES)]
+
+def indeed_page(count=25):
+    cards = ""
+    for i in range(count):
+        role, company = _job(i)
+        cards += (f'<div class="cardOutline"><div class="job_seen_beacon" data-jk="jk{i:04d}">'
+                  f'<h2 class="jobTitle"><a data-jk="jk{i:04d}" href="/rc/clk?jk=jk{i:04d}"><span>{role}</span></a></h2>'
+                  f'<div class="company_location"><span class="companyName">{company}</span>'
+                  f'<div class="companyLocation">Mumbai, Maharashtra</div></div>'
+                  f'<div class="job-snippet"><ul><li>Work on real projects</li><li>Stipend provided</li></ul></div>'
+                  f'</div></div>')
+    return _page(cards)
+
+def glassdoor_page(count=30):
+    cards = ""
+    for i in range(count):
+        role, company = _job(i)
+        cards += (f'<li class="react-job-listing css-bkasv9" data-id="{i}">'
+                  f'<div><a data-test="employer-link" href="/Overview/{i}">{company}</a></div>'
+                  f'<a data-test="job-link" href="/job-listing/{i}.htm">{role}</a>'
+                  f'<div class="d-flex"><span data-test="emp-location">Mumbai</span><span>30d+</span></div></li>')
+    return _page(f"<ul>{cards}</ul>")
+
+def internshala_page(count=40):
+    cards = ""
+    for i in range(count):
+        role, company = _job(i)
+        cards += (f'<div class="individual_internship"><div class="internship_details">'
+                  f'<div class="heading"><a class="view_detail_button" href="/internship/detail/{i}">{role}</a></div>'
+                  f'<div class="company"><a class="company_name" href="/company/{i}">{company}</a></div>'
+                  f'<div id="location_names"><span><a class="location_link" href="/internships/internship-in-mumbai">Mumbai</a></span></div>'
+                  f'<div class="other_detail_item"><span>3 Months</span><span>10,000 /month</span></div>'
+                  f'</div></div>')
+    return _page(cards)
+
+def google_page(count=10):
+    cards = ""
+    for i in range(count):
+        role, company = _job(i)
+        cards += (f'<div class="g"><div class="yuRUbf"><a href="https://careers.example.com/{i}">'
+                  f'<h3>{role} - {company}</h3></a></div>'
+                  f'<div class="VwiC3b"><span class="b">{company}</span> is hiring interns in Mumbai.</div></div>')
+    return _page(cards, blocks=60)
+
+def linkedin_login_page():
+    # Submitting lands on /linkedin/feed, which the scraper treats as a successful login
+    return ('<!DOCTYPE html><html><body><form method="get" action="feed">'
+            '<input id="username" name="session_key"><input id="password" name="session_password" type="password">'
+            '</form></body></html>')
+
+def linkedin_page(count=25):
+    cards = ""
+    for i in range(count):
+        role, company = _job(i)
+        cards += (f'<li><div class="base-card job-search-card">'
+                  f'<h3 class="base-search-card__title"><a href="https://www.linkedin.com/jobs/view/{i}?trk=public">{role}</a></h3>'
+                  f'<h4 class="base-search-card__subtitle"><a href="/company/{i}">{company}</a></h4>'
+                  f'<span class="job-search-card__location">Mumbai</span></div></li>')
+    return _page(f"<ul>{cards}</ul>")
+
+PAGES = {
+    "linkedin": linkedin_page,
+    "indeed": indeed_page,
+    "glassdoor": glassdoor_page,
+    "internshala": internshala_page,
+    "google": google_page,
+}
@@ -0,0 +1,314 @@
+"""Offline load test for the scrape endpoints.
+
+    python bench/run_bench.py --endpoint submit-profile --concurrency 8 --requests 64 --output before.json
+    python bench/run_bench.py --endpoint test-scrape --compare before.json
+
+Job sites are replaced by the local stand-in (standin.py) and the Supabase
+and Twilio clients by in-memory stubs, so nothing leaves the machine. The
+Selenium sources are skipped unless --selenium is given, in which case Chrome
+is driven against the stand-in too. Results are written as JSON so two runs
+can be diffed with --compare.
+"""
+import argparse
+import contextlib
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+from standin import start_standin, standin_env  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+QUERIES = [
+    ("python,react", "Mumbai"),
+    ("java,spring", "Bangalore"),
+    ("javascript,node", "Pune"),
+    ("python,django", "Delhi"),
+    ("c++,embedded", "Hyderabad"),
+    ("data science,python", "Chennai"),
+]
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+
+class StubTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.pending = None
+        self.filters = {}
+        self.window = (0, 0)
+
+    def insert(self, data):
+        self.pending = data if isinstance(data, list) else [data]
+        return self
+
+    def select(self, *args, **kwargs):
+        self.pending = None
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, count):
+        self.window = (0, count - 1)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def execute(self):
+        if self.pending is not None:
+            self.rows.extend(self.pending)
+            return StubResponse(self.pending)
+        rows = [row for row in self.rows if all(row.get(column) == value for column, value in self.filters.items())]
+        start, end = self.window
+        return StubResponse(rows[start:end + 1])
+
+class StubSupabase:
+    def __init__(self):
+        self.rows = []
+
+    def table(self, name):
+        return StubTable(self.rows)
+
+class StubMessages:
+    def __init__(self):
+        self.sent = 0
+
+    def create(self, to, from_, body):
+        self.sent += 1
+        return type("Message", (), {"sid": f"SM{self.sent:06d}"})()
+
+class StubAccount:
+    def fetch(self):
+        return self
+
+class StubApi:
+    def accounts(self, sid):
+        return StubAccount()
+
+class StubTwilio:
+    def __init__(self):
+        self.messages = StubMessages()
+        self.api = StubApi()
+
+def chrome_usage():
+    """Return (process count, total RSS in MB) of running Chrome/chromedriver processes"""
+    if psutil:
+        count, rss = 0, 0
+        for process in psutil.process_iter(["name", "memory_info"]):
+            if "chrome" in (process.info["name"] or "").lower():
+                count += 1
+                rss += process.info["memory_info"].rss if process.info["memory_info"] else 0
+        return count, rss / (1024 * 1024)
+    count = 0
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/comm") as comm:
+                count += "chrome" in comm.read().lower()
+        except OSError:
+            continue
+    return count, 0.0
+
+class Sampler(threading.Thread):
+    """Track peak Chrome process count and RSS while the load runs"""
+
+    def __init__(self, interval=0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.running = True
+        self.peak_processes = 0
+        self.peak_chrome_rss = 0.0
+
+    def run(self):
+        while self.running:
+            count, rss = chrome_usage()
+            self.peak_processes = max(self.peak_processes, count)
+            self.peak_chrome_rss = max(self.peak_chrome_rss, rss)
+            time.sleep(self.interval)
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index] * 1000, 1)
+
+def summarize(latencies):
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "max": round(max(latencies) * 1000, 1) if latencies else None,
+        "mean": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None
+    }
+
+def setup_app(args):
+    server, base_url = start_standin(latency_ms=args.site_latency_ms)
+    os.environ.update(standin_env(base_url))
+    os.environ["LOCAL_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="ducky-bench-"), "bench.db")
+    if not args.selenium:
+        os.environ["DRIVER_POOL_WARM"] = "0"
+
+    import app
+
+    app.supabase = StubSupabase()
+    app.twilio_client = StubTwilio()
+    app.twilio_number = "+10000000000"
+
+    if not args.selenium:
+        app.PRIMARY_SOURCES[:] = [source for source in app.PRIMARY_SOURCES if source["name"] != "linkedin"]
+        for source in app.PRIMARY_SOURCES:
+            if source["name"] == "indeed":
+                source["scraper"] = app.scrape_indeed_basic
+    if not args.cache:
+        for source in app.PRIMARY_SOURCES + [app.FALLBACK_SOURCE]:
+            source["cache_ttl"] = 0
+        app.result_cache.stale_seconds = 0
+        app.job_index.max_age = 0
+
+    from werkzeug.serving import make_server
+    http_server = make_server("127.0.0.1", 0, app.app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    return app, f"http://127.0.0.1:{http_server.server_port}"
+
+def run_one(api_url, endpoint, index, timeout):
+    """Issue one request and return (end-to-end latency, submit latency)"""
+    skills, location = QUERIES[index % len(QUERIES)]
+    session = requests.Session()
+    started = time.perf_counter()
+
+    if endpoint == "test-scrape":
+        response = session.post(f"{api_url}/api/test-scrape", json={"skills": skills, "location": location}, timeout=timeout)
+        response.raise_for_status()
+        elapsed = time.perf_counter() - started
+        return elapsed, elapsed
+
+    response = session.post(f"{api_url}/api/submit-profile", json={
+        "name": f"Bench Candidate {index}",
+        "email": f"bench{index}@example.com",
+        "phone": "9999999999",
+        "techStacks": skills,
+        "location": location,
+        "smsNotifications": True
+    }, timeout=timeout)
+    response.raise_for_status()
+    submitted = time.perf_counter() - started
+
+    task_id = response.json()["task_id"]
+    while time.perf_counter() - started < timeout:
+        task = session.get(f"{api_url}/api/tasks/{task_id}", timeout=timeout).json()
+        if task["status"] == "done":
+            return time.perf_counter() - started, submitted
+        if task["status"] == "failed":
+            raise RuntimeError(task["error"])
+        time.sleep(0.05)
+    raise TimeoutError(f"Task {task_id} did not finish in {timeout}s")
+
+def run(args):
+    app, api_url = setup_app(args)
+    requests.get(f"{api_url}/api/test", timeout=10)
+
+    sampler = Sampler()
+    sampler.start()
+    latencies, submit_latencies, errors = [], [], []
+    lock = threading.Lock()
+
+    def worker(index):
+        try:
+            latency, submitted = run_one(api_url, args.endpoint, index, args.timeout)
+            with lock:
+                latencies.append(latency)
+                submit_latencies.append(submitted)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, range(args.requests)))
+    wall = time.perf_counter() - started
+    sampler.running = False
+
+    results = {
+        "requests": args.requests,
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "wall_seconds": round(wall, 3),
+        "latency_ms": summarize(latencies),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_chrome_processes": sampler.peak_processes,
+        "peak_chrome_rss_mb": round(sampler.peak_chrome_rss, 1)
+    }
+    if args.endpoint == "submit-profile":
+        results["submit_latency_ms"] = summarize(submit_latencies)
+    if errors:
+        results["sample_errors"] = errors[:5]
+
+    return {
+        "config": {
+            "endpoint": args.endpoint,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "selenium": args.selenium,
+            "cache": args.cache,
+            "site_latency_ms": args.site_latency_ms
+        },
+        "results": results
+    }
+
+def compare(report, baseline_path):
+    """Print every numeric metric next to its baseline value"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+
+    def walk(current, previous, prefix=""):
+        for key, value in current.items():
+            old = previous.get(key) if isinstance(previous, dict) else None
+            if isinstance(value, dict):
+                walk(value, old, f"{prefix}{key}.")
+            elif isinstance(value, (int, float)) and isinstance(old, (int, float)):
+                change = f"{(value - old) / old * 100:+.1f}%" if old else "n/a"
+                print(f"{prefix + key:<28} {old:>12} -> {value:<12} {change}")
+
+    walk(report["results"], baseline)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=["submit-profile", "test-scrape"], default="submit-profile")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--site-latency-ms", type=int, default=150, help="delay the stand-in adds to every page")
+    parser.add_argument("--selenium", action="store_true", help="include the Chrome-based scrapers")
+    parser.add_argument("--cache", action="store_true", help="leave the result cache and job index enabled")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    # The app logs to stdout, keep that clear for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(args)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True))
+    if args.compare:
+        compare(report, args.compare)
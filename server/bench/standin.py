@@ -0,0 +1,81 @@
+"""Local HTTP stand-in for the job sites, serving the pages from fixtures.py.
+
+    python bench/standin.py --port 8099 [--latency-ms 200]
+
+Each site lives under its own prefix (/indeed, /glassdoor, /internshala,
+/google, /linkedin). Point app.py at it with the *_BASE_URL variables, which
+standin_env() returns ready to use.
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fixtures import PAGES, linkedin_login_page
+
+ROUTES = [
+    ("/linkedin/login", linkedin_login_page),
+    ("/linkedin/feed", lambda: "<html><body>Feed</body></html>"),
+    ("/linkedin/jobs/search", PAGES["linkedin"]),
+    ("/indeed/jobs", PAGES["indeed"]),
+    ("/glassdoor/jobs/", PAGES["glassdoor"]),
+    ("/internshala/internships/", PAGES["internshala"]),
+    ("/google/search", PAGES["google"]),
+]
+
+def make_handler(latency):
+    # Pages are rendered once, so serving costs the same as replaying a recording
+    rendered = [(prefix, render().encode()) for prefix, render in ROUTES]
+
+    class StandinHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            for prefix, body in rendered:
+                if self.path.startswith(prefix):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    return StandinHandler
+
+def start_standin(port=0, latency_ms=0):
+    """Serve the stand-in in a daemon thread and return (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency_ms / 1000))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def standin_env(base_url):
+    return {
+        "LINKEDIN_BASE_URL": f"{base_url}/linkedin",
+        "INDEED_BASE_URL": f"{base_url}/indeed",
+        "GLASSDOOR_BASE_URL": f"{base_url}/glassdoor",
+        "INTERNSHALA_BASE_URL": f"{base_url}/internshala",
+        "GOOGLE_BASE_URL": f"{base_url}/google",
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+    server, base_url = start_standin(args.port, args.latency_ms)
+    print(f"Stand-in serving on {base_url}")
+    for name, value in standin_env(base_url).items():
+        print(f"export {name}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,14 @@
+# Load the app once in the master and fork workers from it, so module import
+# and the heavy scraping libraries are paid for once rather than per worker.
+preload_app = True
+
+
+def when_ready(server):
+    import app
+    app.warm_imports()
+
+
+def post_fork(server, worker):
+    # Threads do not survive a fork, start the background work in each worker
+    import app
+    app.start_background_tasks()